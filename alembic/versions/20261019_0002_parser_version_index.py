@@ -0,0 +1,17 @@
+"""index parsed_signals.parser_version"""
+
+from alembic import op
+
+
+revision = "20261019_0002"
+down_revision = "20260216_0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_parsed_signals_parser_version", "parsed_signals", ["parser_version"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_parsed_signals_parser_version", table_name="parsed_signals")
@@ -0,0 +1,18 @@
+"""trades.fills_json for monitor fill state"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0003"
+down_revision = "20261019_0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("trades", sa.Column("fills_json", sa.JSON(), server_default="[]", nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column("trades", "fills_json")
@@ -0,0 +1,24 @@
+"""reply chain: raw_messages.reply_to_message_id, trades.raw_message_id"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0004"
+down_revision = "20261019_0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("raw_messages", sa.Column("reply_to_message_id", sa.Integer(), nullable=True))
+    op.create_index("ix_raw_messages_chat_message", "raw_messages", ["chat_id", "message_id"])
+    op.add_column("trades", sa.Column("raw_message_id", sa.Integer(), sa.ForeignKey("raw_messages.id"), nullable=True))
+    op.create_index("ix_trades_raw_message_id", "trades", ["raw_message_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_trades_raw_message_id", table_name="trades")
+    op.drop_column("trades", "raw_message_id")
+    op.drop_index("ix_raw_messages_chat_message", table_name="raw_messages")
+    op.drop_column("raw_messages", "reply_to_message_id")
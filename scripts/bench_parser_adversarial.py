@@ -0,0 +1,59 @@
+"""Adversarial-input benchmark for src.parser.
+
+Times parse_text (split + parse) on inputs built to trigger regex backtracking and checks
+that runtime grows linearly: doubling the input size must not grow the
+runtime by more than MAX_GROWTH. Exits non-zero on failure.
+
+    python scripts/bench_parser_adversarial.py
+"""
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src import metrics  # noqa: E402
+from src.parser import parse_text  # noqa: E402
+
+SIZES = (4_000, 8_000, 16_000, 32_000)
+MAX_GROWTH = 3.0
+REPEAT = 3
+
+CASES = {
+    "entry_digit_space_run": lambda n: "вход " + "1 " * n,
+    "entry_dotted_run": lambda n: "вход " + "1." * n,
+    "percent_digit_run": lambda n: "$BTCUSDT long\n" + "1" * n,
+    "leading_whitespace": lambda n: "вход 1\n" + " " * n + "x",
+    "tp_whitespace": lambda n: "tp" + " " * n + "x",
+    "sl_whitespace": lambda n: "sl" + " " * n + "x",
+    "side_line_no_side": lambda n: "BTCUSDT " + "a " * n,
+    "many_trader_lines": lambda n: "trader\n" * (n // 8),
+}
+
+
+def _best_of(text: str) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        parse_text(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> int:
+    metrics.set_enabled(False)
+    failed = False
+    for name, build in CASES.items():
+        timings = [_best_of(build(n)) for n in SIZES]
+        growth = max(b / max(a, 1e-6) for a, b in zip(timings, timings[1:]))
+        ok = growth <= MAX_GROWTH
+        failed |= not ok
+        cells = "  ".join(f"{n:>6}:{t * 1000:8.2f}ms" for n, t in zip(SIZES, timings))
+        print(f"{'ok ' if ok else 'BAD'} {name:<24} {cells}  growth x{growth:.2f}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
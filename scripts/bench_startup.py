@@ -0,0 +1,61 @@
+"""Startup benchmark for parser and worker entry points.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter,
+reports the cumulative import time of each entry point and fails when it
+exceeds its budget or pulls in a heavy dependency (ORM, web, bot).
+
+    python scripts/bench_startup.py
+"""
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Cumulative import time budgets in milliseconds.
+BUDGETS_MS = {
+    "src.parser": 80,
+    "src.worker.parse_worker": 120,
+}
+FORBIDDEN = ("sqlalchemy", "fastapi", "aiogram", "psycopg")
+REPEAT = 5
+
+
+def _import_profile(module: str) -> tuple[float, set[str]]:
+    """Return the module's cumulative import time (ms) and every module imported."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total_us = 0
+    imported: set[str] = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line.split("|"))
+        imported.add(name)
+        if name == module:
+            total_us = int(cumulative)
+    return total_us / 1000, imported
+
+
+def main() -> int:
+    failed = False
+    for module, budget in BUDGETS_MS.items():
+        runs = [_import_profile(module) for _ in range(REPEAT)]
+        best = min(ms for ms, _ in runs)
+        heavy = sorted({m for m in runs[0][1] if m.split(".")[0] in FORBIDDEN})
+        ok = best <= budget and not heavy
+        failed |= not ok
+        extra = f"  heavy imports: {', '.join(heavy)}" if heavy else ""
+        print(f"{'ok ' if ok else 'BAD'} {module:<26} {best:7.1f}ms (budget {budget}ms){extra}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
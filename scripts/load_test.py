@@ -0,0 +1,314 @@
+"""End-to-end load test: fake Telegram feed -> bot -> worker(s) -> API.
+
+Feeds messages at a fixed rate through the real ``handle_text`` handler
+using fake aiogram messages. Parse workers drain ``raw_messages`` while the
+feed is running, and ``/trades`` is polled at the same time from a separate
+thread with its own event loop, so the feed's synchronous DB commits don't
+show up in API latency and the pollers don't skew the feed pacing. Reports intake
+throughput, parse lag percentiles (``RawMessage.ts`` to ``ParsedSignal.ts``)
+and API latency percentiles.
+
+Needs a migrated local Postgres (``docker compose up -d postgres && alembic
+upgrade head``) and ``API_AUTH_SECRET``:
+
+    python scripts/load_test.py --rate 50 --duration 60 --workers 2 --spawn-api
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import multiprocessing as mp
+import os
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+SAMPLES = ROOT / "fixtures" / "setups_samples.txt"
+# Kept inside int32: raw_messages.chat_id/message_id are INTEGER columns.
+LOAD_CHAT_ID = -900_000_001
+# Telegram ids of the seeded load-test accounts; the bot stores the sender id as trader_id.
+TRADER_TG_ID = 900_000_001
+ADMIN_TG_ID = 900_000_002
+SYMBOLS = ("BTCUSDT", "ETHUSDT", "SOLUSDT", "XRPUSDT", "DOGEUSDT")
+CHATTER = ("всем привет", "рынок сегодня вялый", "gm", "кто в лонге?", "ждём ФРС")
+
+
+def load_samples(path: Path = SAMPLES) -> list[str]:
+    text = path.read_text(encoding="utf-8")
+    return [chunk.strip() for chunk in re.split(r"\n(?=\[trader )", text) if chunk.strip()]
+
+
+def synthetic_message(rng: random.Random) -> str:
+    if rng.random() < 0.3:
+        return rng.choice(CHATTER)
+    symbol = rng.choice(SYMBOLS)
+    side = rng.choice(("LONG", "SHORT"))
+    entry = round(rng.uniform(1, 1000), 2)
+    sign = -1 if side == "LONG" else 1
+    sl = round(entry * (1 + sign * 0.02), 2)
+    tps = [round(entry * (1 - sign * 0.02 * k), 2) for k in (1, 2, 3)]
+    lines = [f"${symbol} - {side}", f"Вход {entry}", f"Stop {sl}", "Тейк-профит"]
+    lines += [f"{i}) {tp}" for i, tp in enumerate(tps, start=1)]
+    return "\n".join(lines)
+
+
+def percentiles(values: list[float], points=(50, 90, 95, 99)) -> dict[int, float]:
+    if not values:
+        return {p: float("nan") for p in points}
+    ordered = sorted(values)
+    return {p: ordered[min(len(ordered) - 1, round(p / 100 * (len(ordered) - 1)))] for p in points}
+
+
+def _fmt(label: str, values: list[float], unit: str = "ms", scale: float = 1000.0) -> str:
+    pct = percentiles(values)
+    parts = " ".join(f"p{p}={pct[p] * scale:.1f}{unit}" for p in pct)
+    return f"{label:<12} n={len(values):<7} {parts}"
+
+
+class FakeMessage(SimpleNamespace):
+    """Just enough of ``aiogram.types.Message`` for ``handle_text``."""
+
+    async def answer(self, text: str) -> None:
+        return None
+
+
+def fake_message(message_id: int, text: str) -> FakeMessage:
+    return FakeMessage(
+        message_id=message_id,
+        text=text,
+        chat=SimpleNamespace(id=LOAD_CHAT_ID),
+        from_user=SimpleNamespace(id=TRADER_TG_ID),
+        reply_to_message=None,
+    )
+
+
+def seed_accounts() -> int:
+    """Create the load-test trader/admin if missing; return the current max raw message id."""
+    from sqlalchemy import func
+
+    from src.db.models import RawMessage, Trader, User, UserRole
+    from src.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        for tg_id, role in ((TRADER_TG_ID, UserRole.TRADER), (ADMIN_TG_ID, UserRole.ADMIN)):
+            user = db.query(User).filter(User.telegram_user_id == tg_id).one_or_none()
+            if user is None:
+                user = User(telegram_user_id=tg_id, role=role)
+                db.add(user)
+                db.flush()
+        if db.get(Trader, TRADER_TG_ID) is None:
+            trader_user = db.query(User).filter(User.telegram_user_id == TRADER_TG_ID).one()
+            db.add(Trader(id=TRADER_TG_ID, user_id=trader_user.id))
+        db.commit()
+        return db.query(func.max(RawMessage.id)).scalar() or 0
+
+
+async def feed(rate: float, duration: float, synthetic: float, seed: int) -> tuple[int, float]:
+    from src.bot.bot import handle_text
+
+    rng = random.Random(seed)
+    samples = load_samples()
+    interval = 1.0 / rate
+    first_message_id = int(time.time()) % 100_000 * 10_000
+    started = time.perf_counter()
+    sent = 0
+    while (elapsed := time.perf_counter() - started) < duration:
+        due = int(elapsed * rate) + 1
+        while sent < due:
+            text = synthetic_message(rng) if rng.random() < synthetic else rng.choice(samples)
+            await handle_text(fake_message(first_message_id + sent, text))
+            sent += 1
+        await asyncio.sleep(max(0.0, (sent * interval) - (time.perf_counter() - started)))
+    return sent, time.perf_counter() - started
+
+
+def _shard_repo(shard: int, shards: int):
+    from src.db.models import ParsedSignal, RawMessage
+    from src.db.session import SessionLocal
+    from src.worker.parse_worker import RawMessageLike, SqlAlchemyWorkerRepository
+
+    class ShardedRepository(SqlAlchemyWorkerRepository):
+        # Partition by id so concurrent workers never claim the same message.
+        def fetch_unparsed_raw_messages(self, limit: int = 100) -> list[RawMessageLike]:
+            with SessionLocal() as db:
+                rows = (
+                    db.query(RawMessage)
+                    .outerjoin(ParsedSignal, ParsedSignal.raw_message_id == RawMessage.id)
+                    .filter(ParsedSignal.id.is_(None), RawMessage.id % shards == shard)
+                    .order_by(RawMessage.id.asc())
+                    .limit(limit)
+                    .all()
+                )
+                return [
+                    RawMessageLike(
+                        id=row.id,
+                        text=row.text,
+                        chat_id=row.chat_id,
+                        reply_to_message_id=row.reply_to_message_id,
+                        trader_id=row.trader_id,
+                    )
+                    for row in rows
+                ]
+
+    return ShardedRepository()
+
+
+def worker_loop(shard: int, shards: int, stop, batch: int) -> None:
+    from src import metrics
+    from src.worker.parse_worker import parse_once
+
+    metrics.set_enabled(False)
+    repo = _shard_repo(shard, shards)
+    while True:
+        handled = parse_once(repo, limit=batch)
+        if handled == 0:
+            if stop.is_set():
+                return
+            time.sleep(0.05)
+
+
+@dataclass
+class ApiStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+
+async def poll_api(base_url: str, concurrency: int, stop: threading.Event) -> ApiStats:
+    import httpx
+
+    from src.api.auth import issue_token
+
+    stats = ApiStats()
+    headers = {"Authorization": f"Bearer {issue_token(ADMIN_TG_ID)}"}
+
+    async def client_loop(client: httpx.AsyncClient) -> None:
+        etag = None
+        while not stop.is_set():
+            req_headers = dict(headers, **({"If-None-Match": etag} if etag else {}))
+            started = time.perf_counter()
+            try:
+                resp = await client.get("/trades", headers=req_headers)
+            except httpx.HTTPError:
+                stats.errors += 1
+                await asyncio.sleep(0.1)
+                continue
+            stats.latencies.append(time.perf_counter() - started)
+            if resp.status_code not in (200, 304):
+                stats.errors += 1
+            etag = resp.headers.get("etag", etag)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=10.0) as client:
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+    return stats
+
+
+def parse_lags(after_id: int) -> tuple[list[float], int]:
+    """Lag of the first ParsedSignal per message written after ``after_id``; also returns unparsed count."""
+    from sqlalchemy import func
+
+    from src.db.models import ParsedSignal, RawMessage
+    from src.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        rows = (
+            db.query(RawMessage.ts, func.min(ParsedSignal.ts))
+            .outerjoin(ParsedSignal, ParsedSignal.raw_message_id == RawMessage.id)
+            .filter(RawMessage.id > after_id, RawMessage.chat_id == LOAD_CHAT_ID)
+            .group_by(RawMessage.id, RawMessage.ts)
+            .all()
+        )
+    lags = [(parsed - raw).total_seconds() for raw, parsed in rows if parsed is not None]
+    return lags, sum(1 for _, parsed in rows if parsed is None)
+
+
+def _wait_for_api(base_url: str, proc: subprocess.Popen, timeout_s: float = 20.0) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline and proc.poll() is None:
+        try:
+            httpx.get(f"{base_url}/health", timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    raise RuntimeError(f"API at {base_url} did not come up")
+
+
+async def run(args: argparse.Namespace) -> int:
+    if not os.getenv("API_AUTH_SECRET"):
+        print("API_AUTH_SECRET is required", file=sys.stderr)
+        return 2
+    after_id = seed_accounts()
+
+    api_proc = None
+    ctx = mp.get_context("spawn")
+    stop_workers = ctx.Event()
+    workers = [ctx.Process(target=worker_loop, args=(i, args.workers, stop_workers, args.batch)) for i in range(args.workers)]
+    stop_api = threading.Event()
+    api_task = None
+    try:
+        if args.spawn_api:
+            port = args.api_url.rsplit(":", 1)[-1].split("/")[0]
+            api_proc = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "src.api.main:app", "--port", port, "--log-level", "warning"], cwd=ROOT
+            )
+            _wait_for_api(args.api_url, api_proc)
+        for proc in workers:
+            proc.start()
+        if args.api_concurrency:
+            api_task = asyncio.ensure_future(
+                asyncio.to_thread(asyncio.run, poll_api(args.api_url, args.api_concurrency, stop_api))
+            )
+        sent, feed_s = await feed(args.rate, args.duration, args.synthetic, args.seed)
+        drain_started = time.perf_counter()
+        stop_workers.set()
+        for proc in workers:
+            await asyncio.to_thread(proc.join, args.drain_timeout)
+        drain_s = time.perf_counter() - drain_started
+        stop_api.set()
+        api = await api_task if api_task else ApiStats()
+    finally:
+        stop_workers.set()
+        stop_api.set()
+        for proc in workers:
+            if proc.is_alive():
+                proc.terminate()
+        if api_proc is not None:
+            api_proc.terminate()
+            api_proc.wait()
+
+    lags, unparsed = parse_lags(after_id)
+    print(f"intake       sent={sent} in {feed_s:.1f}s -> {sent / feed_s:.1f} msg/s (target {args.rate:g})")
+    print(f"drain        {drain_s:.1f}s after feed stopped, unparsed={unparsed}")
+    print(_fmt("parse lag", lags))
+    if api_task:
+        print(_fmt("api /trades", api.latencies) + f" errors={api.errors}")
+    return 1 if unparsed else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=float, default=20.0, help="messages per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="feed duration in seconds")
+    parser.add_argument("--synthetic", type=float, default=0.5, help="share of synthetic messages (0..1)")
+    parser.add_argument("--workers", type=int, default=1, help="parse worker processes")
+    parser.add_argument("--batch", type=int, default=100, help="parse_once batch size")
+    parser.add_argument("--api-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--api-concurrency", type=int, default=4, help="concurrent /trades pollers (0 disables)")
+    parser.add_argument("--spawn-api", action="store_true", help="start uvicorn for the run")
+    parser.add_argument("--drain-timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    return asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import os
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qsl
+
+from src.api.cache import TTLCache
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+TOKEN_TTL_S = 7 * 24 * 3600
+TELEGRAM_LOGIN_MAX_AGE_S = 24 * 3600
+IDENTITY_CACHE_TTL_S = float(os.getenv("API_IDENTITY_CACHE_TTL", "60"))
+
+
+class AuthError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class Identity:
+    role: str
+    trader_id: int | None
+
+
+def _auth_secret() -> bytes:
+    secret = os.getenv("API_AUTH_SECRET", "")
+    if not secret:
+        raise AuthError("API_AUTH_SECRET is not configured")
+    return secret.encode("utf-8")
+
+
+def _sign(message: str, secret: bytes) -> str:
+    digest = hmac.new(secret, message.encode("utf-8"), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=").decode("ascii")
+
+
+def issue_token(telegram_user_id: int, ttl_s: int = TOKEN_TTL_S, now: float | None = None) -> str:
+    """Token format: ``<telegram_user_id>.<expires_unix>.<hmac>``."""
+    expires = int((now if now is not None else time.time()) + ttl_s)
+    body = f"{telegram_user_id}.{expires}"
+    return f"{body}.{_sign(body, _auth_secret())}"
+
+
+def verify_token(token: str, now: float | None = None) -> int:
+    try:
+        user_part, expires_part, signature = token.split(".")
+        telegram_user_id, expires = int(user_part), int(expires_part)
+    except ValueError as exc:
+        raise AuthError("malformed token") from exc
+    if not hmac.compare_digest(signature, _sign(f"{user_part}.{expires_part}", _auth_secret())):
+        raise AuthError("bad token signature")
+    if expires < (now if now is not None else time.time()):
+        raise AuthError("token expired")
+    return telegram_user_id
+
+
+def verify_telegram_login(payload: str, bot_token: str | None = None, now: float | None = None) -> int:
+    """Check a Telegram Login Widget payload (query-string encoded) and return the user id."""
+    bot_token = bot_token if bot_token is not None else os.getenv("BOT_TOKEN", "")
+    if not bot_token:
+        raise AuthError("BOT_TOKEN is not configured")
+    fields = dict(parse_qsl(payload, keep_blank_values=True))
+    received = fields.pop("hash", "")
+    data_check = "\n".join(f"{k}={v}" for k, v in sorted(fields.items()))
+    expected = hmac.new(hashlib.sha256(bot_token.encode("utf-8")).digest(), data_check.encode("utf-8"), hashlib.sha256).hexdigest()
+    if not received or not hmac.compare_digest(received, expected):
+        raise AuthError("bad Telegram login hash")
+    try:
+        auth_date, telegram_user_id = int(fields["auth_date"]), int(fields["id"])
+    except (KeyError, ValueError) as exc:
+        raise AuthError("incomplete Telegram login payload") from exc
+    if (now if now is not None else time.time()) - auth_date > TELEGRAM_LOGIN_MAX_AGE_S:
+        raise AuthError("Telegram login expired")
+    return telegram_user_id
+
+
+identity_cache: TTLCache[int, Identity] = TTLCache(maxsize=10_000, ttl_s=IDENTITY_CACHE_TTL_S)
+
+
+def resolve_identity(db: Session, telegram_user_id: int) -> Identity | None:
+    """Role and trader id for a Telegram user, served from ``identity_cache`` when fresh."""
+    cached = identity_cache.get(telegram_user_id)
+    if cached is not None:
+        return cached
+
+    from src.db.models import Trader, User
+
+    row = (
+        db.query(User.role, Trader.id)
+        .outerjoin(Trader, Trader.user_id == User.id)
+        .filter(User.telegram_user_id == telegram_user_id)
+        .one_or_none()
+    )
+    if row is None:
+        return None
+    role, trader_id = row
+    identity = Identity(role=getattr(role, "value", role), trader_id=trader_id)
+    identity_cache.set(telegram_user_id, identity)
+    return identity
+
+
+def invalidate_identity(telegram_user_id: int) -> None:
+    identity_cache.invalidate(telegram_user_id)
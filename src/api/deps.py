@@ -1,17 +1,73 @@
 from __future__ import annotations
 
-from fastapi import Header, HTTPException
+import os
 
+from fastapi import Depends, Header, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from src.api.auth import AuthError, resolve_identity, verify_telegram_login, verify_token
 from src.api.rbac import CurrentUser
+from src.db.session import get_db
+
+
+def _header_auth_allowed() -> bool:
+    return os.getenv("API_ALLOW_HEADER_AUTH", "").lower() in {"1", "true", "yes", "on"}
+
+
+def _telegram_user_id(
+    authorization: str | None,
+    x_telegram_login: str | None,
+    x_telegram_user_id: int | None,
+) -> int:
+    try:
+        if authorization:
+            scheme, _, token = authorization.partition(" ")
+            if scheme.lower() != "bearer" or not token:
+                raise HTTPException(status_code=401, detail="Authorization must be a Bearer token")
+            return verify_token(token.strip())
+        if x_telegram_login:
+            return verify_telegram_login(x_telegram_login)
+    except AuthError as exc:
+        raise HTTPException(status_code=401, detail=str(exc)) from exc
+    if x_telegram_user_id is not None and _header_auth_allowed():
+        return x_telegram_user_id
+    raise HTTPException(status_code=401, detail="Bearer token or x-telegram-login header is required")
+
+
+def _current_user(db: Session, telegram_user_id: int) -> CurrentUser:
+    identity = resolve_identity(db, telegram_user_id)
+    if identity is None:
+        raise HTTPException(status_code=403, detail="unknown user")
+    return CurrentUser(telegram_user_id=telegram_user_id, role=identity.role, trader_id=identity.trader_id)
 
 
 def get_current_user(
+    authorization: str | None = Header(default=None),
+    x_telegram_login: str | None = Header(default=None),
     x_telegram_user_id: int | None = Header(default=None),
-    x_role: str | None = Header(default=None),
+    db: Session = Depends(get_db),
 ) -> CurrentUser:
-    if x_telegram_user_id is None:
-        raise HTTPException(status_code=401, detail="x-telegram-user-id header is required")
-    role = (x_role or "TRADER").upper()
-    if role not in {"ADMIN", "TRADER"}:
-        raise HTTPException(status_code=400, detail="x-role must be ADMIN or TRADER")
-    return CurrentUser(telegram_user_id=x_telegram_user_id, role=role)
+    return _current_user(db, _telegram_user_id(authorization, x_telegram_login, x_telegram_user_id))
+
+
+def get_stream_user(
+    authorization: str | None = Header(default=None),
+    x_telegram_login: str | None = Header(default=None),
+    x_telegram_user_id: int | None = Header(default=None),
+    access_token: str | None = Query(default=None),
+    # Closed before the streaming response starts, so SSE clients don't hold pooled connections.
+    db: Session = Depends(get_db, scope="function"),
+) -> CurrentUser:
+    """``get_current_user`` for ``/stream``; EventSource cannot send headers, so it also takes ``?access_token=``."""
+    if access_token and not authorization:
+        try:
+            return _current_user(db, verify_token(access_token))
+        except AuthError as exc:
+            raise HTTPException(status_code=401, detail=str(exc)) from exc
+    return _current_user(db, _telegram_user_id(authorization, x_telegram_login, x_telegram_user_id))
+
+
+def require_admin(user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
+    if user.role.upper() != "ADMIN":
+        raise HTTPException(status_code=403, detail="admin role required")
+    return user
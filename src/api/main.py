@@ -1,14 +1,57 @@
 from __future__ import annotations
 
+import asyncio
+import os
+import time
 from datetime import date
 from typing import Annotated, Literal
 
-from fastapi import Depends, FastAPI, Query
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
 
-from src.api.deps import get_current_user
+from src import metrics as prom
+from src.api.auth import invalidate_identity
+from src.api.deps import get_current_user, get_stream_user, require_admin
 from src.api.rbac import CurrentUser, apply_trade_scope
+from src.api.response_cache import response_cache
+from src.api.stream import broker, listen_postgres, sse_events
+from src.db.models import User, UserRole
+from src.db.session import DATABASE_URL, get_db
+from src.db.versions import register_version_listeners
 
 app = FastAPI(title="Cloud Journal v1")
+register_version_listeners()
+
+
+@app.middleware("http")
+async def observe_request_latency(request: Request, call_next):
+    if not prom.enabled():
+        return await call_next(request)
+    started = time.perf_counter()
+    response = await call_next(request)
+    route = getattr(request.scope.get("route"), "path", "unmatched")
+    prom.API_REQUEST_SECONDS.labels(request.method, route, response.status_code).observe(time.perf_counter() - started)
+    return response
+
+
+@app.on_event("startup")
+async def start_event_stream() -> None:
+    if os.getenv("STREAM_PG_LISTEN", "").lower() in {"1", "true", "yes", "on"} and DATABASE_URL.startswith("postgresql"):
+        dsn = DATABASE_URL.replace("postgresql+psycopg://", "postgresql://", 1)
+        app.state.listen_task = asyncio.create_task(listen_postgres(dsn))
+
+
+@app.on_event("shutdown")
+async def stop_event_stream() -> None:
+    task = getattr(app.state, "listen_task", None)
+    if task is not None:
+        task.cancel()
+
+
+@app.get("/internal/metrics", include_in_schema=False)
+def prometheus_metrics() -> Response:
+    return Response(content=prom.REGISTRY.render(), media_type=prom.CONTENT_TYPE)
 
 
 @app.get("/health")
@@ -18,31 +61,40 @@ def health() -> dict[str, str]:
 
 @app.get("/trades")
 def get_trades(
+    request: Request,
     user: Annotated[CurrentUser, Depends(get_current_user)],
     date_from: date | None = Query(default=None),
     date_to: date | None = Query(default=None),
     symbol: str | None = Query(default=None),
     status: str | None = Query(default=None),
     trader_telegram_user_id: int | None = Query(default=None),
-) -> dict:
-    _ = (date_from, date_to, symbol, status, trader_telegram_user_id)
-    records: list[dict] = []
-    scoped = apply_trade_scope(records, user)
-    return {"items": scoped, "count": len(scoped)}
+) -> Response:
+    def build() -> dict:
+        _ = (date_from, date_to, symbol, status, trader_telegram_user_id)
+        records: list[dict] = []
+        scoped = apply_trade_scope(records, user)
+        return {"items": scoped, "count": len(scoped)}
+
+    return response_cache.respond(request, user, build)
 
 
 @app.get("/metrics")
 def metrics(
+    request: Request,
     user: Annotated[CurrentUser, Depends(get_current_user)],
     date_from: date | None = Query(default=None),
     date_to: date | None = Query(default=None),
-) -> dict:
-    _ = (user, date_from, date_to)
-    return {"items": []}
+) -> Response:
+    def build() -> dict:
+        _ = (date_from, date_to)
+        return {"items": []}
+
+    return response_cache.respond(request, user, build)
 
 
 @app.get("/export")
 def export_data(
+    request: Request,
     user: Annotated[CurrentUser, Depends(get_current_user)],
     format: Literal["csv", "json"] = Query(default="json"),
     date_from: date | None = Query(default=None),
@@ -50,9 +102,26 @@ def export_data(
     symbol: str | None = Query(default=None),
     status: str | None = Query(default=None),
     trader_telegram_user_id: int | None = Query(default=None),
-) -> dict:
-    _ = (user, format, date_from, date_to, symbol, status, trader_telegram_user_id)
-    return {"format": format, "items": []}
+) -> Response:
+    def build() -> dict:
+        _ = (date_from, date_to, symbol, status, trader_telegram_user_id)
+        return {"format": format, "items": []}
+
+    return response_cache.respond(request, user, build)
+
+
+@app.get("/stream")
+async def stream_events(
+    request: Request,
+    user: Annotated[CurrentUser, Depends(get_stream_user)],
+) -> StreamingResponse:
+    """Server-sent events for new parsed signals and trade updates in the caller's scope."""
+    sub = broker.subscribe(user)
+    return StreamingResponse(
+        sse_events(sub, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.post("/import")
@@ -62,3 +131,20 @@ def import_data(
 ) -> dict:
     _ = (user, format)
     return {"format": format, "imported": 0}
+
+
+@app.patch("/admin/users/{telegram_user_id}/role")
+def set_user_role(
+    telegram_user_id: int,
+    admin: Annotated[CurrentUser, Depends(require_admin)],
+    role: Literal["ADMIN", "TRADER"] = Query(),
+    db: Session = Depends(get_db),
+) -> dict:
+    _ = admin
+    user = db.query(User).filter(User.telegram_user_id == telegram_user_id).one_or_none()
+    if user is None:
+        raise HTTPException(status_code=404, detail="user not found")
+    user.role = UserRole(role)
+    db.commit()
+    invalidate_identity(telegram_user_id)
+    return {"telegram_user_id": telegram_user_id, "role": role}
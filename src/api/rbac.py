@@ -8,9 +8,16 @@ from typing import Any
 class CurrentUser:
     telegram_user_id: int
     role: str
+    trader_id: int | None = None
+
+
+def _owns(item: dict[str, Any], user: CurrentUser) -> bool:
+    if user.trader_id is not None and item.get("trader_id") == user.trader_id:
+        return True
+    return item.get("telegram_user_id") == user.telegram_user_id
 
 
 def apply_trade_scope(items: list[dict[str, Any]], user: CurrentUser) -> list[dict[str, Any]]:
     if user.role.upper() == "ADMIN":
         return items
-    return [x for x in items if x.get("telegram_user_id") == user.telegram_user_id]
+    return [x for x in items if _owns(x, user)]
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import Request, Response
+
+from src.api.cache import TTLCache
+from src.api.rbac import CurrentUser
+from src.db.versions import DataVersions, data_versions
+from src.jsonutil import dumps_json_bytes
+
+RESPONSE_CACHE_TTL_S = float(os.getenv("API_RESPONSE_CACHE_TTL", "30"))
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    version: str
+    etag: str
+    body: bytes
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    candidates = {c.strip().removeprefix("W/") for c in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+class ResponseCache:
+    """Serialized JSON responses keyed by (path, query, RBAC scope).
+
+    An entry is reused while the scope's data version is unchanged; the TTL
+    bounds staleness for writes made by other processes.
+    """
+
+    def __init__(self, versions: DataVersions, maxsize: int = 2048, ttl_s: float = RESPONSE_CACHE_TTL_S) -> None:
+        self.versions = versions
+        self._entries: TTLCache[tuple, CachedResponse] = TTLCache(maxsize=maxsize, ttl_s=ttl_s)
+
+    @staticmethod
+    def scope_of(user: CurrentUser) -> tuple[str, int | None]:
+        if user.role.upper() == "ADMIN":
+            return ("admin", None)
+        return ("trader", user.trader_id if user.trader_id is not None else -user.telegram_user_id)
+
+    def respond(self, request: Request, user: CurrentUser, build: Callable[[], Any]) -> Response:
+        scope = self.scope_of(user)
+        key = (request.url.path, tuple(sorted(request.query_params.multi_items())), scope)
+        version = self.versions.for_scope(user.trader_id, admin=scope[0] == "admin")
+
+        entry = self._entries.get(key)
+        if entry is None or entry.version != version:
+            body = dumps_json_bytes(build())
+            entry = CachedResponse(version=version, etag=f'"{hashlib.sha1(body).hexdigest()}"', body=body)
+            self._entries.set(key, entry)
+
+        headers = {"ETag": entry.etag, "Cache-Control": "private, no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+response_cache = ResponseCache(data_versions)
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.api.rbac import CurrentUser
+from src.db.notify import EVENTS_CHANNEL
+from src.db.versions import data_versions
+from src.jsonutil import dumps_json
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIBER_QUEUE_SIZE = int(os.getenv("STREAM_QUEUE_SIZE", "256"))
+HEARTBEAT_S = 15.0
+
+
+@dataclass(eq=False)
+class Subscriber:
+    user: CurrentUser
+    queue: asyncio.Queue[dict[str, Any]]
+    dropped: int = 0
+    lagged: bool = field(default=False)
+
+    def wants(self, event: dict[str, Any]) -> bool:
+        if self.user.role.upper() == "ADMIN":
+            return True
+        return self.user.trader_id is not None and event.get("trader_id") == self.user.trader_id
+
+
+class EventBroker:
+    """Fan out events to SSE subscribers in the API process.
+
+    Each subscriber has a bounded queue. When a slow consumer's queue is full
+    the oldest event is dropped and the client gets a ``lagged`` event, so it
+    knows to refetch instead of holding up the others.
+    """
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE) -> None:
+        self.queue_size = queue_size
+        self._subscribers: set[Subscriber] = set()
+
+    def subscribe(self, user: CurrentUser) -> Subscriber:
+        sub = Subscriber(user=user, queue=asyncio.Queue(maxsize=self.queue_size))
+        self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscriber) -> None:
+        self._subscribers.discard(sub)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event: dict[str, Any]) -> None:
+        """Deliver ``event``; must run on the broker's event loop."""
+        for sub in list(self._subscribers):
+            if not sub.wants(event):
+                continue
+            if sub.queue.full():
+                sub.queue.get_nowait()
+                sub.dropped += 1
+                sub.lagged = True
+            sub.queue.put_nowait(event)
+
+
+broker = EventBroker()
+
+
+def handle_notification(payload: str) -> None:
+    try:
+        event = json.loads(payload)
+    except ValueError:
+        logger.warning("ignoring malformed %s payload", EVENTS_CHANNEL)
+        return
+    # Keeps the response cache coherent with writes from other processes.
+    data_versions.bump(event.get("trader_id"))
+    broker.publish(event)
+
+
+async def listen_postgres(dsn: str, channel: str = EVENTS_CHANNEL) -> None:
+    """Forward Postgres NOTIFY events to the broker, reconnecting on errors."""
+    import psycopg
+
+    while True:
+        try:
+            async with await psycopg.AsyncConnection.connect(dsn, autocommit=True) as conn:
+                await conn.execute(f"LISTEN {channel}")
+                async for notify in conn.notifies():
+                    handle_notification(notify.payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("LISTEN %s failed, reconnecting", channel)
+            await asyncio.sleep(5)
+
+
+def _sse(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {dumps_json(data)}\n\n"
+
+
+async def sse_events(sub: Subscriber, is_disconnected, heartbeat_s: float = HEARTBEAT_S) -> AsyncIterator[str]:
+    try:
+        yield ": connected\n\n"
+        while not await is_disconnected():
+            try:
+                event = await asyncio.wait_for(sub.queue.get(), timeout=heartbeat_s)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if sub.lagged:
+                sub.lagged = False
+                yield _sse("lagged", {"dropped": sub.dropped})
+            yield _sse(event.get("type", "message"), event)
+    finally:
+        broker.unsubscribe(sub)
@@ -3,8 +3,11 @@ from __future__ import annotations
 import os
 
 from aiogram import Bot, Dispatcher, F
+from aiogram.filters import Command
 from aiogram.types import Message
 
+from src import metrics
+from src.api.auth import issue_token
 from src.db.models import RawMessage
 from src.db.session import SessionLocal
 
@@ -14,15 +17,28 @@ BOT_TOKEN = os.getenv("BOT_TOKEN", "")
 dp = Dispatcher()
 
 
+@dp.message(Command("token"), F.chat.type == "private")
+async def handle_token(message: Message) -> None:
+    await message.answer(f"API token (7 days):\n{issue_token(int(message.from_user.id))}")
+
+
+@dp.message(Command("token"))
+async def refuse_token_outside_private_chat(message: Message) -> None:
+    # Tokens can't be revoked, so they're never posted where others can read them.
+    await message.answer("Токен выдаётся только в личном чате с ботом.")
+
+
 @dp.message(F.text)
 async def handle_text(message: Message) -> None:
     trader_id = int(message.from_user.id)
-    with SessionLocal() as db:
+    reply = message.reply_to_message
+    with metrics.BOT_MESSAGES_SECONDS.time(), SessionLocal() as db:
         db.add(
             RawMessage(
                 trader_id=trader_id,
                 chat_id=int(message.chat.id),
                 message_id=int(message.message_id),
+                reply_to_message_id=int(reply.message_id) if reply is not None else None,
                 text=message.text or "",
             )
         )
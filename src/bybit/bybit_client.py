@@ -9,3 +9,50 @@ def get_instruments() -> list[dict]:
 def get_ticker(symbol: str) -> dict:
     """Stub for future Bybit integration."""
     return {"symbol": symbol, "price": None}
+
+
+PUBLIC_LINEAR_WS_URL = "wss://stream.bybit.com/v5/public/linear"
+PING_INTERVAL_S = 20.0
+
+
+async def stream_tickers(symbols: list[str], url: str = PUBLIC_LINEAR_WS_URL):
+    """Yield ``(symbol, last_price, ts_seconds)`` from Bybit public tickers.
+
+    Requires the optional ``websockets`` package. Reconnects on errors.
+    """
+    import asyncio
+    import json
+    import logging
+
+    import websockets
+
+    logger = logging.getLogger(__name__)
+    subscribe = json.dumps({"op": "subscribe", "args": [f"tickers.{s}" for s in symbols]})
+    ping = json.dumps({"op": "ping"})
+
+    while True:
+        try:
+            async with websockets.connect(url, ping_interval=None) as ws:
+                await ws.send(subscribe)
+                loop = asyncio.get_running_loop()
+                last_ping = loop.time()
+                while True:
+                    try:
+                        raw = await asyncio.wait_for(ws.recv(), timeout=PING_INTERVAL_S)
+                    except asyncio.TimeoutError:
+                        raw = None
+                    if loop.time() - last_ping >= PING_INTERVAL_S:
+                        await ws.send(ping)
+                        last_ping = loop.time()
+                    if raw is None:
+                        continue
+                    msg = json.loads(raw)
+                    data = msg.get("data")
+                    if not msg.get("topic", "").startswith("tickers.") or not data or "lastPrice" not in data:
+                        continue
+                    yield data["symbol"], float(data["lastPrice"]), msg.get("ts", 0) / 1000
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("bybit ticker stream failed, reconnecting")
+            await asyncio.sleep(5)
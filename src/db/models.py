@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import DateTime, Enum as SAEnum, Float, ForeignKey, Integer, JSON, String, Text
+from sqlalchemy import DateTime, Enum as SAEnum, Float, ForeignKey, Index, Integer, JSON, String, Text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -51,11 +51,14 @@ class Trader(Base):
 
 class RawMessage(Base):
     __tablename__ = "raw_messages"
+    # Reply lookups resolve (chat_id, reply_to_message_id) to the original message.
+    __table_args__ = (Index("ix_raw_messages_chat_message", "chat_id", "message_id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     trader_id: Mapped[int] = mapped_column(ForeignKey("traders.id"), index=True)
     chat_id: Mapped[int] = mapped_column(Integer, index=True)
     message_id: Mapped[int] = mapped_column(Integer, index=True)
+    reply_to_message_id: Mapped[int | None] = mapped_column(Integer)
     text: Mapped[str] = mapped_column(Text)
     ts: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
 
@@ -72,7 +75,7 @@ class ParsedSignal(Base):
     payload_json: Mapped[dict] = mapped_column(JSON, default=dict)
     errors_json: Mapped[list] = mapped_column(JSON, default=list)
     warnings_json: Mapped[list] = mapped_column(JSON, default=list)
-    parser_version: Mapped[str] = mapped_column(String(32), default="v1", nullable=False)
+    parser_version: Mapped[str] = mapped_column(String(32), default="v1", nullable=False, index=True)
     ts: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
 
     raw_message: Mapped[RawMessage] = relationship(back_populates="parsed_signals")
@@ -83,12 +86,14 @@ class Trade(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     trader_id: Mapped[int] = mapped_column(ForeignKey("traders.id"), index=True)
+    raw_message_id: Mapped[int | None] = mapped_column(ForeignKey("raw_messages.id"), index=True)
     symbol: Mapped[str] = mapped_column(String(32), index=True)
     side: Mapped[str] = mapped_column(String(16))
     entries_json: Mapped[list] = mapped_column(JSON, default=list)
     sl: Mapped[float | None] = mapped_column(Float)
     tps_json: Mapped[list] = mapped_column(JSON, default=list)
     position_pct: Mapped[float | None] = mapped_column(Float)
+    fills_json: Mapped[list] = mapped_column(JSON, default=list, server_default="[]", nullable=False)
     status: Mapped[TradeStatus] = mapped_column(SAEnum(TradeStatus), default=TradeStatus.DRAFT, nullable=False)
     ts: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
 
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from src.jsonutil import dumps_json
+
+EVENTS_CHANNEL = "journal_events"
+# Postgres rejects NOTIFY payloads of 8000 bytes or more.
+MAX_PAYLOAD_BYTES = 7900
+
+
+def notify_event(db: Session, event: dict[str, Any]) -> bool:
+    """Queue ``event`` on EVENTS_CHANNEL; delivered when ``db`` commits.
+
+    A no-op on databases without LISTEN/NOTIFY (e.g. SQLite in tests).
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    payload = dumps_json(event)
+    if len(payload.encode("utf-8")) > MAX_PAYLOAD_BYTES:
+        payload = dumps_json({k: v for k, v in event.items() if k != "data"})
+    db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": EVENTS_CHANNEL, "payload": payload})
+    return True
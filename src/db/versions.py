@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import threading
+from collections import defaultdict
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from src.db.models import ParsedSignal, Trade
+
+_PENDING_KEY = "journal_bumped_traders"
+UNSCOPED = None
+
+
+class DataVersions:
+    """Monotonic per-trader data versions used to invalidate cached reads.
+
+    ``bump(None)`` marks a write whose trader is unknown; it invalidates every
+    scope.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._global = 0
+        self._unscoped = 0
+        self._by_trader: defaultdict[int, int] = defaultdict(int)
+
+    def bump(self, trader_id: int | None) -> None:
+        with self._lock:
+            self._global += 1
+            if trader_id is None:
+                self._unscoped += 1
+            else:
+                self._by_trader[trader_id] += 1
+
+    def for_scope(self, trader_id: int | None, admin: bool) -> str:
+        with self._lock:
+            if admin:
+                return f"g{self._global}"
+            return f"t{self._by_trader.get(trader_id, 0) if trader_id is not None else 0}.u{self._unscoped}"
+
+
+data_versions = DataVersions()
+
+
+def _trader_of(obj: object) -> int | None:
+    if isinstance(obj, Trade):
+        return obj.trader_id
+    if isinstance(obj, ParsedSignal):
+        raw = obj.__dict__.get("raw_message")
+        return raw.trader_id if raw is not None else UNSCOPED
+    return UNSCOPED
+
+
+def _after_flush(session: Session, flush_context: object) -> None:
+    pending = session.info.setdefault(_PENDING_KEY, set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, (Trade, ParsedSignal)):
+            pending.add(_trader_of(obj))
+
+
+def _after_commit(session: Session) -> None:
+    for trader_id in session.info.pop(_PENDING_KEY, ()):
+        data_versions.bump(trader_id)
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+_registered = False
+
+
+def register_version_listeners() -> None:
+    """Bump ``data_versions`` after every committed Trade/ParsedSignal write in this process."""
+    global _registered
+    if _registered:
+        return
+    event.listen(Session, "after_flush", _after_flush)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_rollback", _after_rollback)
+    _registered = True
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+
+INF = float("inf")
+
+
+@dataclass(frozen=True, order=True)
+class Level:
+    price: float
+    trade_id: int
+    kind: str  # "sl" | "tp" | "entry"
+    index: int = 0
+
+
+@dataclass
+class SymbolLevels:
+    """Sorted trigger levels of one symbol.
+
+    ``crossed`` finds the levels between two prices with two bisections, so a
+    tick costs O(log n + hits) regardless of how many trades are open.
+    """
+
+    levels: list[Level] = field(default_factory=list)
+
+    def add(self, level: Level) -> None:
+        insort(self.levels, level)
+
+    def remove(self, level: Level) -> None:
+        i = bisect_left(self.levels, level)
+        if i < len(self.levels) and self.levels[i] == level:
+            del self.levels[i]
+
+    def crossed(self, prev: float, price: float) -> list[Level]:
+        """Levels in (prev, price] moving up or [price, prev) moving down, in path order."""
+        if price > prev:
+            lo = bisect_left(self.levels, Level(prev, INF, ""))
+            hi = bisect_left(self.levels, Level(price, INF, ""))
+            return self.levels[lo:hi]
+        if price < prev:
+            lo = bisect_left(self.levels, Level(price, -INF, ""))
+            hi = bisect_left(self.levels, Level(prev, -INF, ""))
+            return self.levels[lo:hi][::-1]
+        return []
+
+    def __len__(self) -> int:
+        return len(self.levels)
@@ -0,0 +1,386 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Protocol
+
+from src.monitor.levels import Level, SymbolLevels
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Tick:
+    symbol: str
+    price: float
+    ts: float
+
+
+@dataclass
+class MonitoredTrade:
+    id: int
+    trader_id: int | None
+    symbol: str
+    side: str
+    sl: float | None
+    tps: list[float]
+    entries: list[float | None]
+    fills: list[dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class TradeUpdate:
+    trade_id: int
+    trader_id: int | None
+    new_fills: list[dict[str, Any]] = field(default_factory=list)
+    close: bool = False
+
+
+class MonitorRepository(Protocol):
+    def load_open_trades(self) -> list[MonitoredTrade]: ...
+
+    def apply_updates(self, updates: list[TradeUpdate]) -> None: ...
+
+
+def entry_trigger_price(entry: dict[str, Any], side: str) -> float | None:
+    """Price at which a pending entry fills; zones fill at their near edge."""
+    if entry.get("type") == "zone":
+        return entry.get("price_max") if side == "long" else entry.get("price_min")
+    if entry.get("type") == "market":
+        return None
+    return entry.get("price")
+
+
+class PriceMonitor:
+    """Keeps per-symbol level indexes for open trades and applies crossings."""
+
+    def __init__(self) -> None:
+        self._levels: dict[str, SymbolLevels] = {}
+        self._trades: dict[int, MonitoredTrade] = {}
+        self._trade_levels: dict[int, list[Level]] = {}
+        # SL/TP levels of trades not entered yet; activated by the first entry fill.
+        self._dormant: dict[int, list[Level]] = {}
+        self._last_price: dict[str, float] = {}
+        self._pending: dict[int, TradeUpdate] = {}
+
+    def load(self, trades: list[MonitoredTrade]) -> None:
+        self._levels.clear()
+        self._trades.clear()
+        self._trade_levels.clear()
+        self._dormant.clear()
+        for trade in trades:
+            self.add_trade(trade)
+
+    @staticmethod
+    def is_entered(trade: MonitoredTrade) -> bool:
+        """Market (or unspecified) entries are in from the start; limits need a fill."""
+        if not trade.entries or any(p is None for p in trade.entries):
+            return True
+        return any(f.get("kind") == "entry" for f in trade.fills)
+
+    def add_trade(self, trade: MonitoredTrade) -> None:
+        filled = {(f.get("kind"), f.get("index", 0)) for f in trade.fills}
+        exits: list[Level] = []
+        if trade.sl is not None:
+            exits.append(Level(trade.sl, trade.id, "sl"))
+        exits += [Level(p, trade.id, "tp", i) for i, p in enumerate(trade.tps) if p is not None]
+        entries = [Level(p, trade.id, "entry", i) for i, p in enumerate(trade.entries) if p is not None]
+        exits = [lv for lv in exits if (lv.kind, lv.index) not in filled]
+        entries = [lv for lv in entries if (lv.kind, lv.index) not in filled]
+
+        self._trades[trade.id] = trade
+        self._trade_levels[trade.id] = []
+        if self.is_entered(trade):
+            self._activate(trade, entries + exits)
+        else:
+            self._activate(trade, entries)
+            self._dormant[trade.id] = exits
+
+    def _activate(self, trade: MonitoredTrade, new_levels: list[Level]) -> None:
+        levels = self._levels.setdefault(trade.symbol, SymbolLevels())
+        for level in new_levels:
+            levels.add(level)
+        self._trade_levels[trade.id].extend(new_levels)
+
+    def _drop_trade(self, trade: MonitoredTrade) -> None:
+        levels = self._levels[trade.symbol]
+        for level in self._trade_levels.pop(trade.id, []):
+            levels.remove(level)
+        self._dormant.pop(trade.id, None)
+        self._trades.pop(trade.id, None)
+
+    def _update_for(self, trade: MonitoredTrade) -> TradeUpdate:
+        update = self._pending.get(trade.id)
+        if update is None:
+            update = self._pending[trade.id] = TradeUpdate(trade_id=trade.id, trader_id=trade.trader_id)
+        return update
+
+    def on_tick(self, tick: Tick) -> list[Level]:
+        prev = self._last_price.get(tick.symbol)
+        self._last_price[tick.symbol] = tick.price
+        levels = self._levels.get(tick.symbol)
+        if prev is None or levels is None:
+            return []
+
+        hits: list[Level] = []
+        start: float | None = prev
+        # An entry fill activates SL/TP levels; the rest of the move, from the
+        # entry price on, is checked again so a gap through entry and SL hits both.
+        while start is not None:
+            start = self._cross(levels, start, tick, hits)
+        return hits
+
+    def _cross(self, levels: SymbolLevels, start: float, tick: Tick, hits: list[Level]) -> float | None:
+        resume_from = None
+        for level in levels.crossed(start, tick.price):
+            trade = self._trades.get(level.trade_id)
+            if trade is None:
+                continue
+            hits.append(level)
+            fill = {"kind": level.kind, "index": level.index, "price": level.price, "ts": tick.ts}
+            trade.fills.append(fill)
+            update = self._update_for(trade)
+            update.new_fills.append(fill)
+            tps_done = sum(1 for f in trade.fills if f["kind"] == "tp") == len(trade.tps)
+            if level.kind == "sl" or (level.kind == "tp" and tps_done):
+                update.close = True
+                self._drop_trade(trade)
+                continue
+            levels.remove(level)
+            self._trade_levels[trade.id].remove(level)
+            dormant = self._dormant.pop(trade.id, None) if level.kind == "entry" else None
+            if dormant:
+                self._activate(trade, dormant)
+                if resume_from is None:
+                    resume_from = level.price
+        return resume_from
+
+    def drain_updates(self) -> list[TradeUpdate]:
+        updates = list(self._pending.values())
+        self._pending.clear()
+        return updates
+
+    def requeue(self, updates: list[TradeUpdate]) -> None:
+        """Put back updates whose write failed, ahead of fills recorded since."""
+        for update in updates:
+            newer = self._pending.get(update.trade_id)
+            if newer is not None:
+                update.new_fills.extend(newer.new_fills)
+                update.close = update.close or newer.close
+            self._pending[update.trade_id] = update
+
+    @property
+    def level_count(self) -> int:
+        return sum(len(x) for x in self._levels.values())
+
+
+class SymbolSubscription:
+    """Symbols the live feed should stream; refreshed by ``run_monitor`` on every reload."""
+
+    def __init__(self) -> None:
+        self.symbols: frozenset[str] = frozenset()
+        self.changed = asyncio.Event()
+
+    def update(self, symbols: set[str]) -> None:
+        if symbols != self.symbols:
+            self.symbols = frozenset(symbols)
+            self.changed.set()
+
+
+async def run_monitor(
+    monitor: PriceMonitor,
+    ticks: AsyncIterator[Tick],
+    repo: MonitorRepository,
+    flush_interval_s: float = 1.0,
+    reload_interval_s: float = 30.0,
+    subscription: SymbolSubscription | None = None,
+) -> int:
+    """Consume ``ticks`` and write trade updates in batches; returns ticks processed.
+
+    Flushes and reloads of open trades run on a timer, so they also happen
+    while no ticks arrive (e.g. nothing is subscribed yet). Pending updates
+    are flushed before a reload so it never resurrects levels that were
+    already hit. A failed write keeps its updates pending and skips the
+    reload; both are retried on the next timer tick.
+    """
+
+    def flush() -> None:
+        updates = monitor.drain_updates()
+        if not updates:
+            return
+        try:
+            repo.apply_updates(updates)
+        except Exception:
+            monitor.requeue(updates)
+            raise
+
+    def reload() -> None:
+        flush()
+        trades = repo.load_open_trades()
+        monitor.load(trades)
+        if subscription is not None:
+            subscription.update({t.symbol for t in trades})
+
+    async def housekeeping() -> None:
+        last_reload = time.monotonic()
+        while True:
+            await asyncio.sleep(min(flush_interval_s, reload_interval_s))
+            try:
+                if time.monotonic() - last_reload >= reload_interval_s:
+                    reload()
+                    last_reload = time.monotonic()
+                else:
+                    flush()
+            except Exception:
+                logger.exception("monitor housekeeping failed; retrying on the next tick")
+
+    reload()
+    timer = asyncio.create_task(housekeeping())
+    processed = 0
+    try:
+        async for tick in ticks:
+            monitor.on_tick(tick)
+            processed += 1
+    finally:
+        timer.cancel()
+    flush()
+    return processed
+
+
+async def live_ticks(subscription: SymbolSubscription, stream=None) -> AsyncIterator[Tick]:
+    """Ticks from ``stream`` (Bybit by default), resubscribing when the symbol set changes."""
+    if stream is None:
+        from src.bybit.bybit_client import stream_tickers as stream
+
+    while True:
+        subscription.changed.clear()
+        if not subscription.symbols:
+            await subscription.changed.wait()
+            continue
+        source = stream(sorted(subscription.symbols))
+        changed = asyncio.ensure_future(subscription.changed.wait())
+        try:
+            while True:
+                nxt = asyncio.ensure_future(anext(source))
+                done, _ = await asyncio.wait({nxt, changed}, return_when=asyncio.FIRST_COMPLETED)
+                if nxt not in done:
+                    nxt.cancel()
+                    with contextlib.suppress(asyncio.CancelledError, StopAsyncIteration):
+                        await nxt
+                    break
+                symbol, price, ts = nxt.result()
+                yield Tick(symbol=symbol, price=price, ts=ts)
+        finally:
+            changed.cancel()
+            await source.aclose()
+
+
+async def replay_ticks(path: str | Path, speed: float = 0.0) -> AsyncIterator[Tick]:
+    """Replay recorded ticks from NDJSON (``{"ts", "symbol", "price"}`` per line).
+
+    ``speed`` > 0 sleeps the recorded gaps divided by ``speed``; 0 replays as
+    fast as possible.
+    """
+    prev_ts = None
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            tick = Tick(symbol=row["symbol"], price=float(row["price"]), ts=float(row["ts"]))
+            if speed > 0 and prev_ts is not None and tick.ts > prev_ts:
+                await asyncio.sleep((tick.ts - prev_ts) / speed)
+            prev_ts = tick.ts
+            yield tick
+
+
+class SqlAlchemyMonitorRepository:
+    def load_open_trades(self) -> list[MonitoredTrade]:
+        from src.db.models import Trade, TradeStatus
+        from src.db.session import SessionLocal
+
+        with SessionLocal() as db:
+            rows = db.query(Trade).filter(Trade.status == TradeStatus.OPEN).all()
+            return [
+                MonitoredTrade(
+                    id=row.id,
+                    trader_id=row.trader_id,
+                    symbol=row.symbol,
+                    side=row.side,
+                    sl=row.sl,
+                    tps=list(row.tps_json or []),
+                    entries=[entry_trigger_price(e, row.side) for e in row.entries_json or []],
+                    fills=list(row.fills_json or []),
+                )
+                for row in rows
+            ]
+
+    def apply_updates(self, updates: list[TradeUpdate]) -> None:
+        from src import metrics
+        from src.db.models import Trade, TradeStatus
+        from src.db.notify import notify_event
+        from src.db.session import SessionLocal
+
+        with metrics.DB_WRITE_SECONDS.labels("monitor_apply_updates").time(), SessionLocal() as db:
+            # Trades closed or cancelled elsewhere (e.g. a reply update) since the last reload are skipped.
+            rows = (
+                db.query(Trade)
+                .filter(Trade.id.in_([u.trade_id for u in updates]), Trade.status == TradeStatus.OPEN)
+                .with_for_update()
+                .all()
+            )
+            trades = {t.id: t for t in rows}
+            for update in updates:
+                trade = trades.get(update.trade_id)
+                if trade is None:
+                    continue
+                trade.fills_json = [*(trade.fills_json or []), *update.new_fills]
+                if update.close:
+                    trade.status = TradeStatus.CLOSED
+                notify_event(
+                    db,
+                    {
+                        "type": "trade",
+                        "id": trade.id,
+                        "trader_id": trade.trader_id,
+                        "status": trade.status.value,
+                        "data": {"fills": update.new_fills},
+                    },
+                )
+            db.commit()
+
+
+async def _main() -> int:
+    repo = SqlAlchemyMonitorRepository()
+    replay = os.getenv("MONITOR_REPLAY_FILE")
+    subscription = None
+    if replay:
+        ticks = replay_ticks(replay, speed=float(os.getenv("MONITOR_REPLAY_SPEED", "0")))
+    else:
+        subscription = SymbolSubscription()
+        ticks = live_ticks(subscription)
+    return await run_monitor(
+        PriceMonitor(),
+        ticks,
+        repo,
+        flush_interval_s=float(os.getenv("MONITOR_FLUSH_INTERVAL_S", "1")),
+        reload_interval_s=float(os.getenv("MONITOR_RELOAD_INTERVAL_S", "30")),
+        subscription=subscription,
+    )
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    processed = asyncio.run(_main())
+    logger.info("monitor stopped after %d ticks", processed)
+
+
+if __name__ == "__main__":
+    main()
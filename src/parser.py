@@ -1,10 +1,15 @@
 from __future__ import annotations
 
 import re
-from dataclasses import asdict, dataclass
+import time
+from dataclasses import dataclass
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 from typing import Any
 
+from src import metrics
+from src.jsonutil import dumps_json_bytes
+
 CYR_TO_LAT = str.maketrans(
     {
         "А": "A", "В": "B", "Е": "E", "С": "C", "К": "K", "М": "M", "Н": "H", "О": "O", "Р": "P", "Т": "T", "Х": "X", "У": "Y",
@@ -19,20 +24,142 @@ SL_RE = re.compile(r"(?i)\b(sl|stop|стоп|стоп\s*лосс)\b")
 TP_RE = re.compile(r"(?i)\b(tp\d*|[tт]ейк|take\s*profit|[tт]ейк\s*профит)\b")
 ENTRY_MARKET_RE = re.compile(r"(?i)\b(вход\s*(по\s*)?рынку|entry\s*market|вход\s*с\s*текущих|вход\s*рынок)\b")
 ENTRY_LINE_RE = re.compile(r"(?i)\b(вход|entry|усреднение|лимитк)\b")
-NUMBER_TOKEN_RE = re.compile(r"-?\d[\d\s]*(?:[.,]\d+)?")
+NUMBER_TOKEN_RE = re.compile(r"-?\d[\d\s]*+(?:[.,]\d++)?")
+# Numeric runs are only entered at their first character (lookbehind) and
+# consumed possessively, so a long digit/space line is scanned once instead
+# of once per start position.
+RANGE_RE = re.compile(r"(?<![\d\s.,])[\s.,]*+(\d[\d\s.,]*+)-\s*+(\d[\d\s.,]*+)")
+PERCENT_RE = re.compile(r"(?<![\d\s.,])[\s.,]*+(\d[\d\s.,]*+)%")
+ENUM_PREFIX_RE = re.compile(r"^\s*+(?:[-—]\s*+)?\d+[).]\s*")
+ENTRY_PREFIX_RE = re.compile(r"(?i)^\s*+(вход|entry|усреднение)\s*+[:;\-]?\s*")
+SL_PREFIX_RE = re.compile(r"(?i)^\s*+(sl|stop|стоп|стоп\s*лосс)\s*+[:;\-.]?\s*")
+TP_PREFIX_RE = re.compile(r"(?i)^\s*+[-—•]*+\s*+tp\s*+\d*+\s*+[:;\-]?\s*")
 VALID_SYMBOL_RE = re.compile(r"^[A-Z]{2,15}(USDT)?$")
+NON_NUMERIC_RE = re.compile(r"[^0-9.\-]")
+TAGGED_SYMBOL_RE = re.compile(r"[$#]\s*([A-Za-zА-Яа-я]{2,20}(?:USDT)?)")
+SYMBOL_ON_SIDE_LINE_RE = re.compile(r"(?i)^\s*([A-Za-zА-Яа-я]{2,20}(?:USDT)?)\b.*\b(long|short|лонг|шорт)\b")
+LONG_RE = re.compile(r"\b(long|лонг)\b")
+SHORT_RE = re.compile(r"\b(short|шорт)\b")
+NOTE_SPLIT_RE = re.compile(r"\(|🎯|🛡")
+NUMBERED_LINE_RE = re.compile(r"^\s*+\d+[).]")
+NUMBERED_PREFIX_RE = re.compile(r"^\s*+\d+[).]\s*")
+ALLOC_FRACTION_RE = re.compile(r"\((\d+\s*/\s*\d+)\)")
+# Follow-ups posted as replies to a setup (see parse_update). Verbs are listed
+# as whole word forms: a bare stem would also match "закреплю" or "Closer".
+UPDATE_SEGMENT_SPLIT_RE = re.compile(r"[\n;]+")
+NEGATION_BEFORE_RE = re.compile(r"(?i)(?:\bне|\bnot|\bdon'?t|\bno)\s+(?:\w+\s+)?$")
+CANCEL_RE = re.compile(
+    r"(?i)\b(?:отмена|отменяем|отменяю|отменил[аи]?|отмен[её]н[аоы]?|cancel(?:l?ed)?|неактуальн\w*|не\s+актуальн\w*)(?!\w)"
+)
+# Cancelling an order or a single level is not a cancellation of the trade.
+CANCEL_SCOPE_RE = re.compile(r"(?i)\b(?:ордер\w*|order\w*|усредн\w*|averag\w*|лимитк\w*|добор\w*|тейк\w*|tp\d*)(?!\w)")
+STOPPED_OUT_RE = re.compile(r"(?i)\b(?:stopped\s+out|(?:sl|stop)\s+hit|выбил[оаи]?|стоп\s+сработал)(?!\w)")
+CLOSE_RE = re.compile(
+    r"(?i)\b(?:закр(?:ыл[аио]?|ыли|ылись|ылся|ываю|ываем|ываемся|ою|оем|ыть|ыта|ыто|ытие)"
+    r"|фикс(?:ирую|ируем|ировал[аи]?|ация|ану|анул[аи]?|ануть)|скинул[аи]?|clos(?:e|ed|ing))(?!\w)"
+)
+# Amounts that make a close partial: "1/2", "половину"/"half", or an unsized "часть"/"частично".
+CLOSE_FRACTION_RE = re.compile(r"(?<![\d/.,])([1-9])\s*/\s*([2-9]|10)(?![\d/])")
+CLOSE_HALF_RE = re.compile(r"(?i)\b(?:половин\w*|half)(?!\w)")
+CLOSE_PART_RE = re.compile(r"(?i)\b(?:част\w*|partial\w*|part)(?!\w)")
+MOVE_SL_RE = re.compile(
+    r"(?i)\b(?:sl|stop|стоп)\s*+(?:(?:перенос\w*|передвиг\w*|двига\w*|move[ds]?|moving)\s+)?"
+    r"(?:(?P<be_prep>(?:на|в|to|at|->|→)\s*)?(?P<be>бу|б/у|be|безубыт\w*|break\s*-?\s*even)(?!\w)"
+    r"|(?:на|в|to|at|->|→)\s*(?P<price>\d[\d\s]*+(?:[.,]\d++)?)(?!\s*%))"
+)
+SPLIT_MARKERS = ("$", "вход", "tp", "stop")
+
+# Hardened mode limits: lines are truncated to MAX_LINE_LEN characters and a
+# message whose blocks run past the time budget gets the rest as DRAFT.
+MAX_LINE_LEN = 2000
+DEFAULT_TIME_BUDGET_S = 0.25
+
+
+@dataclass(frozen=True, slots=True)
+class Entry:
+    type: str
+    price: float | None = None
+    price_min: float | None = None
+    price_max: float | None = None
 
+    def to_dict(self) -> dict[str, Any]:
+        if self.type == "zone":
+            return {"type": self.type, "price_min": self.price_min, "price_max": self.price_max}
+        return {"type": self.type, "price": self.price}
+
+
+@dataclass(slots=True)
+class Signal:
+    symbol: str | None
+    side: str | None
+    entry: Entry | None
+    entries: list[Entry]
+    sl: float | None
+    tps: list[float]
+    total_position_pct: float | None
+    alloc_fracs: list[str]
 
-@dataclass
+    def to_dict(self) -> dict[str, Any]:
+        # Lists of scalars are shared with the result, not copied.
+        return {
+            "symbol": self.symbol,
+            "side": self.side,
+            "entry": self.entry.to_dict() if self.entry is not None else None,
+            "entries": [e.to_dict() for e in self.entries],
+            "sl": self.sl,
+            "tps": self.tps,
+            "total_position_pct": self.total_position_pct,
+            "alloc_fracs": self.alloc_fracs,
+        }
+
+
+@dataclass(slots=True)
 class ParseResult:
     status: str
     confidence: float
-    signal: dict[str, Any] | None
+    signal: Signal | None
     errors: list[str]
     warnings: list[str]
 
     def to_dict(self) -> dict[str, Any]:
-        return asdict(self)
+        return {
+            "status": self.status,
+            "confidence": self.confidence,
+            "signal": self.signal.to_dict() if self.signal is not None else None,
+            "errors": self.errors,
+            "warnings": self.warnings,
+        }
+
+    def to_json(self) -> bytes:
+        return dumps_json_bytes(self.to_dict())
+
+
+@dataclass(frozen=True, slots=True)
+class UpdateAction:
+    kind: str  # "move_sl" | "partial_close" | "close" | "cancel"
+    price: float | None = None
+    breakeven: bool = False
+    pct: float | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"kind": self.kind, "price": self.price, "breakeven": self.breakeven, "pct": self.pct}
+
+
+class _StageClock:
+    __slots__ = ("timings", "_last")
+
+    def __init__(self, timings: dict[str, float]) -> None:
+        self.timings = timings
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        self.timings[stage] = now - self._last
+        self._last = now
+
+    def report(self) -> None:
+        for stage, seconds in self.timings.items():
+            metrics.PARSE_STAGE_SECONDS.labels(stage).observe(seconds)
 
 
 def normalize_number(raw: str) -> float | None:
@@ -40,7 +167,7 @@ def normalize_number(raw: str) -> float | None:
     if not s:
         return None
     s = s.replace(" ", "").replace(",,", ",").replace(",", ".")
-    s = re.sub(r"[^0-9.\-]", "", s)
+    s = NON_NUMERIC_RE.sub("", s)
     if s.count(".") > 1:
         h, *t = s.split(".")
         s = h + "." + "".join(t)
@@ -60,33 +187,37 @@ def _is_valid_symbol(sym: str | None) -> bool:
     return bool(sym and VALID_SYMBOL_RE.match(sym) and sym not in {"LONG", "SHORT"})
 
 
-def split_setups(text: str) -> list[str]:
-    lines = text.splitlines()
-    blocks: list[list[str]] = []
+def iter_setups(lines: Iterable[str]) -> Iterator[str]:
+    """Incremental form of ``split_setups`` over an iterable of lines."""
     cur: list[str] = []
-
-    def flush() -> None:
-        nonlocal cur
-        if any(x.strip() for x in cur):
-            blocks.append(cur)
-        cur = []
-
+    # Track "current block has a marker" incrementally instead of rescanning
+    # the whole block on every trigger line.
+    has_marker = False
     for line in lines:
+        line = line.rstrip("\r\n")
         trigger = bool(TRADER_SPLIT_RE.search(line) or SYMBOL_SIDE_LINE_RE.search(line))
-        if trigger and any(x.strip() for x in cur):
-            if any("$" in x or "вход" in x.lower() or "tp" in x.lower() or "stop" in x.lower() for x in cur):
-                flush()
+        if trigger and has_marker and any(x.strip() for x in cur):
+            yield "\n".join(cur).strip()
+            cur = []
+            has_marker = False
         cur.append(line)
-    flush()
-    return ["\n".join(b).strip() for b in blocks if any(x.strip() for x in b)]
+        if not has_marker:
+            low = line.lower()
+            has_marker = any(m in low for m in SPLIT_MARKERS)
+    if any(x.strip() for x in cur):
+        yield "\n".join(cur).strip()
+
+
+def split_setups(text: str) -> list[str]:
+    return list(iter_setups(text.splitlines()))
 
 
 def _extract_symbol(block: str) -> str | None:
     candidates: list[str] = []
-    for m in re.finditer(r"[$#]\s*([A-Za-zА-Яа-я]{2,20}(?:USDT)?)", block):
+    for m in TAGGED_SYMBOL_RE.finditer(block):
         candidates.append(normalize_symbol(m.group(1)))
     for line in block.splitlines():
-        m = re.search(r"(?i)^\s*([A-Za-zА-Яа-я]{2,20}(?:USDT)?)\b.*\b(long|short|лонг|шорт)\b", line)
+        m = SYMBOL_ON_SIDE_LINE_RE.search(line)
         if m:
             candidates.append(normalize_symbol(m.group(1)))
     for c in candidates:
@@ -96,9 +227,9 @@ def _extract_symbol(block: str) -> str | None:
 
 
 def _extract_side(text_low: str) -> str | None:
-    if re.search(r"\b(long|лонг)\b", text_low) or "🐂" in text_low:
+    if LONG_RE.search(text_low) or "🐂" in text_low:
         return "long"
-    if re.search(r"\b(short|шорт)\b", text_low) or "🐻" in text_low:
+    if SHORT_RE.search(text_low) or "🐻" in text_low:
         return "short"
     return None
 
@@ -111,9 +242,9 @@ def _first_number(text: str) -> float | None:
     return None
 
 
-def _parse_entry(block: str, warnings: list[str]) -> tuple[dict[str, Any] | None, list[dict[str, Any]]]:
+def _parse_entry(block: str, warnings: list[str]) -> tuple[Entry | None, list[Entry]]:
     lines = block.splitlines()
-    entries: list[dict[str, Any]] = []
+    entries: list[Entry] = []
     in_entry = False
     market = ENTRY_MARKET_RE.search(block.lower()) is not None
 
@@ -129,29 +260,23 @@ def _parse_entry(block: str, warnings: list[str]) -> tuple[dict[str, Any] | None
             continue
 
         # explicit ranges in entry context only
-        rm = re.search(r"(\d[\d\s.,]*)\s*-\s*(\d[\d\s.,]*)", line)
+        rm = RANGE_RE.search(line)
         if rm:
             a = normalize_number(rm.group(1))
             b = normalize_number(rm.group(2))
             if a is not None and b is not None:
                 lo, hi = (a - b, a) if (a >= 1000 and 1 <= b < 1000) else tuple(sorted((a, b)))
-                entries.append({"type": "zone", "price_min": lo, "price_max": hi})
+                entries.append(Entry(type="zone", price_min=lo, price_max=hi))
                 warnings.append("zone entry interpreted from range")
                 continue
 
-        cleaned = re.sub(r"^\s*[-—]?\s*\d+[).]\s*", "", line)
-        cleaned = re.sub(r"(?i)^\s*(вход|entry|усреднение)\s*[:;\-]?\s*", "", cleaned)
+        cleaned = ENUM_PREFIX_RE.sub("", line, count=1)
+        cleaned = ENTRY_PREFIX_RE.sub("", cleaned, count=1)
         n = _first_number(cleaned)
         if n is not None:
-            entries.append({"type": "limit", "price": n})
+            entries.append(Entry(type="limit", price=n))
 
-    uniq: list[dict[str, Any]] = []
-    seen: set[tuple[tuple[str, Any], ...]] = set()
-    for e in entries:
-        key = tuple(sorted(e.items()))
-        if key not in seen:
-            seen.add(key)
-            uniq.append(e)
+    uniq = list(dict.fromkeys(entries))
 
     if market:
         market_price = None
@@ -161,7 +286,7 @@ def _parse_entry(block: str, warnings: list[str]) -> tuple[dict[str, Any] | None
                 break
         if market_price is None:
             warnings.append("market entry without explicit price")
-        return {"type": "market", "price": market_price}, uniq
+        return Entry(type="market", price=market_price), uniq
     return (uniq[0], uniq) if uniq else (None, [])
 
 
@@ -172,8 +297,8 @@ def _parse_sl_tp(block: str) -> tuple[float | None, list[float]]:
     for line in block.splitlines():
         low = line.lower()
         if SL_RE.search(low):
-            base = re.split(r"\(|🎯|🛡", line)[0]
-            base = re.sub(r"(?i)^\s*(sl|stop|стоп|стоп\s*лосс)\s*[:;\-.]?\s*", "", base)
+            base = NOTE_SPLIT_RE.split(line, maxsplit=1)[0]
+            base = SL_PREFIX_RE.sub("", base, count=1)
             n = _first_number(base)
             if n is not None:
                 sl = n
@@ -181,10 +306,10 @@ def _parse_sl_tp(block: str) -> tuple[float | None, list[float]]:
         if TP_RE.search(low):
             in_tp = True
 
-        if TP_RE.search(low) or (in_tp and re.match(r"^\s*\d+[).]", line)):
-            base = re.split(r"\(|🎯|🛡", line)[0]
-            base = re.sub(r"(?i)^\s*[-—•]*\s*tp\s*\d*\s*[:;\-]?\s*", "", base)
-            base = re.sub(r"^\s*\d+[).]\s*", "", base)
+        if TP_RE.search(low) or (in_tp and NUMBERED_LINE_RE.match(line)):
+            base = NOTE_SPLIT_RE.split(line, maxsplit=1)[0]
+            base = TP_PREFIX_RE.sub("", base, count=1)
+            base = NUMBERED_PREFIX_RE.sub("", base, count=1)
             n = _first_number(base)
             if n is not None:
                 tps.append(n)
@@ -199,24 +324,85 @@ def _parse_allocations(block: str) -> tuple[list[float], list[str]]:
         low = line.lower()
         if TP_RE.search(low):
             continue
-        for m in re.finditer(r"(\d[\d\s.,]*)\s*%", line):
+        for m in PERCENT_RE.finditer(line):
             n = normalize_number(m.group(1))
             if n is not None:
                 pcts.append(n)
-        for m in re.finditer(r"\((\d+\s*/\s*\d+)\)", line):
+        for m in ALLOC_FRACTION_RE.finditer(line):
             fracs.append(m.group(1).replace(" ", ""))
     return pcts, fracs
 
 
-def parse_block(block: str) -> dict[str, Any]:
+class _BudgetExceeded(Exception):
+    pass
+
+
+def _check_budget(deadline: float | None) -> None:
+    if deadline is not None and time.perf_counter() > deadline:
+        raise _BudgetExceeded
+
+
+def cap_line_length(text: str, max_len: int = MAX_LINE_LEN) -> tuple[str, bool]:
+    """Truncate lines longer than ``max_len``; returns the text and whether anything was cut."""
+    lines = text.splitlines()
+    if all(len(line) <= max_len for line in lines):
+        return text, False
+    return "\n".join(line[:max_len] for line in lines), True
+
+
+def parse_block_result(
+    block: str,
+    timings: dict[str, float] | None = None,
+    hardened: bool = False,
+    deadline: float | None = None,
+) -> ParseResult:
+    """Parse one setup block.
+
+    When ``timings`` is given (or metrics are enabled) per-stage durations in
+    seconds are recorded into it. ``hardened`` caps line length and checks the
+    ``deadline`` (a ``time.perf_counter()`` value shared by all blocks of a
+    message; ``DEFAULT_TIME_BUDGET_S`` from now when omitted) between stages,
+    returning a DRAFT once it has passed.
+    """
     errors: list[str] = []
     warnings: list[str] = []
+    clock = _StageClock(timings if timings is not None else {}) if timings is not None or metrics.enabled() else None
+    if not hardened:
+        deadline = None
+    else:
+        if deadline is None:
+            deadline = time.perf_counter() + DEFAULT_TIME_BUDGET_S
+        block, truncated = cap_line_length(block)
+        if truncated:
+            warnings.append(f"lines truncated to {MAX_LINE_LEN} characters")
 
-    symbol = _extract_symbol(block)
-    side = _extract_side(block.lower())
-    sl, tps = _parse_sl_tp(block)
-    entry, entries = _parse_entry(block, warnings)
-    alloc_pcts, alloc_fracs = _parse_allocations(block)
+    symbol = side = sl = entry = None
+    tps: list[float] = []
+    entries: list[Entry] = []
+    try:
+        symbol = _extract_symbol(block)
+        side = _extract_side(block.lower())
+        if clock is not None:
+            clock.lap("symbol")
+        _check_budget(deadline)
+        sl, tps = _parse_sl_tp(block)
+        if clock is not None:
+            clock.lap("sl_tp")
+        _check_budget(deadline)
+        entry, entries = _parse_entry(block, warnings)
+        if clock is not None:
+            clock.lap("entry")
+        _check_budget(deadline)
+        alloc_pcts, alloc_fracs = _parse_allocations(block)
+        if clock is not None:
+            clock.lap("allocations")
+        _check_budget(deadline)
+    except _BudgetExceeded:
+        if clock is not None:
+            clock.report()
+        warnings.append("parse time budget exceeded")
+        signal = Signal(symbol, side, entry, entries, sl, tps, None, [])
+        return ParseResult(status="DRAFT", confidence=0.5, signal=signal, errors=["parse time budget exceeded"], warnings=warnings)
 
     total_position_pct = None
     vals = [x for x in alloc_pcts if 0 < x <= 10]
@@ -226,27 +412,28 @@ def parse_block(block: str) -> dict[str, Any]:
         total_position_pct = 1.0
         warnings.append("default total position percent applied: 1%")
 
-    signal = {
-        "symbol": symbol,
-        "side": side,
-        "entry": entry,
-        "entries": entries,
-        "sl": sl,
-        "tps": tps,
-        "total_position_pct": total_position_pct,
-        "alloc_fracs": alloc_fracs,
-    }
+    signal = Signal(
+        symbol=symbol,
+        side=side,
+        entry=entry,
+        entries=entries,
+        sl=sl,
+        tps=tps,
+        total_position_pct=total_position_pct,
+        alloc_fracs=alloc_fracs,
+    )
 
     required_ok = bool(symbol and side and sl is not None and entry is not None and tps)
 
     validation_conflict = False
-    check_entries: list[float] = []
-    if entry and entry.get("type") == "limit" and entry.get("price") is not None:
-        check_entries.append(entry["price"])
-    if entry and entry.get("type") == "zone":
-        check_entries.extend([entry.get("price_min"), entry.get("price_max")])
-
-    for ep in [x for x in check_entries if isinstance(x, (int, float))]:
+    check_entries: list[float | None] = []
+    if entry and entry.type == "limit" and entry.price is not None:
+        check_entries.append(entry.price)
+    if entry and entry.type == "zone":
+        check_entries.extend([entry.price_min, entry.price_max])
+
+    # Without an SL there is nothing to check direction against; the block stays DRAFT.
+    for ep in [x for x in check_entries if isinstance(x, (int, float)) and sl is not None]:
         if side == "long" and not (sl < ep and all(tp > ep for tp in tps)):
             validation_conflict = True
         if side == "short" and not (sl > ep and all(tp < ep for tp in tps)):
@@ -266,12 +453,87 @@ def parse_block(block: str) -> dict[str, Any]:
         errors.append("missing required fields or ambiguous parse")
 
     confidence = 0.95 if status == "READY" and not warnings else 0.8 if status == "READY" else 0.5 if status == "DRAFT" else 0.0
-    return ParseResult(status=status, confidence=confidence, signal=signal if status != "REJECT" else None, errors=errors, warnings=warnings).to_dict()
+    if clock is not None:
+        clock.lap("validate")
+        clock.report()
+    return ParseResult(status=status, confidence=confidence, signal=signal if status != "REJECT" else None, errors=errors, warnings=warnings)
+
+
+def parse_block(block: str) -> dict[str, Any]:
+    return parse_block_result(block).to_dict()
+
+
+def timed_split_setups(text: str) -> list[str]:
+    if not metrics.enabled():
+        return split_setups(text)
+    with metrics.PARSE_STAGE_SECONDS.labels("split").time():
+        return split_setups(text)
 
 
 def parse_text(text: str) -> list[dict[str, Any]]:
-    return [parse_block(block) for block in split_setups(text)]
+    return [parse_block(block) for block in timed_split_setups(text)]
+
+
+def parse_update(text: str) -> list[UpdateAction]:
+    """Actions in a follow-up to a setup ("стоп в бу", "закрыл 50%", "отмена").
+
+    Returns an empty list when the text is not an update, including a new
+    setup (side plus entry) that happens to be posted as a reply.
+    """
+    actions: list[UpdateAction] = []
+    if SIDE_RE.search(text) and ENTRY_LINE_RE.search(text):
+        return actions
+    for segment in UPDATE_SEGMENT_SPLIT_RE.split(text):
+        if not segment.strip():
+            continue
+        if _affirmed(CANCEL_RE, segment) is not None:
+            if not CANCEL_SCOPE_RE.search(segment):
+                actions.append(UpdateAction("cancel"))
+            continue
+        if _affirmed(STOPPED_OUT_RE, segment) is not None:
+            actions.append(UpdateAction("close"))
+            continue
+        if (m := _affirmed(CLOSE_RE, segment)) is not None:
+            actions.append(_close_action(segment, m.end()))
+        if (m := _affirmed(MOVE_SL_RE, segment)) is None:
+            continue
+        if m.group("be"):
+            actions.append(UpdateAction("move_sl", breakeven=True))
+        elif (price := normalize_number(m.group("price"))) is not None and price > 0:
+            actions.append(UpdateAction("move_sl", price=price))
+    return actions
+
+
+def _close_action(segment: str, verb_end: int) -> UpdateAction:
+    """``partial_close`` when the segment sizes the close below 100%, else ``close``."""
+    pm = PERCENT_RE.search(segment, verb_end)
+    pct = normalize_number(pm.group(1)) if pm else None
+    if pct is not None:
+        return UpdateAction("partial_close", pct=pct) if 0 < pct < 100 else UpdateAction("close")
+    if fm := CLOSE_FRACTION_RE.search(segment):
+        num, den = int(fm.group(1)), int(fm.group(2))
+        if num < den:
+            return UpdateAction("partial_close", pct=round(100 * num / den, 2))
+    if CLOSE_HALF_RE.search(segment):
+        return UpdateAction("partial_close", pct=50.0)
+    if CLOSE_PART_RE.search(segment):
+        return UpdateAction("partial_close")
+    return UpdateAction("close")
+
+
+def _affirmed(pattern: re.Pattern[str], segment: str) -> re.Match[str] | None:
+    """First match of ``pattern`` that is not negated ("не закрываем", "not closing")."""
+    for m in pattern.finditer(segment):
+        if not NEGATION_BEFORE_RE.search(segment[: m.start()]):
+            return m
+    return None
 
 
 def load_fixture(path: str | Path) -> str:
     return Path(path).read_text(encoding="utf-8")
+
+
+if __name__ == "__main__":
+    from src.parser_cli import main
+
+    raise SystemExit(main())
@@ -0,0 +1,245 @@
+"""Offline parser CLI: ``python -m src.parser [INPUT] [options]``.
+
+Streams a chat export message by message, parses every setup block and
+writes one NDJSON record per block. Memory stays bounded by the read buffer
+and the in-flight batch, independent of the input size.
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import re
+import sys
+import time
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from pathlib import Path
+from typing import IO, Any
+
+from src import metrics
+from src.jsonutil import dumps_json_bytes
+from src.parser import ParseResult, iter_setups, parse_block_result, split_setups
+from src.prefilter import may_be_signal
+
+FORMATS = ("auto", "text", "ndjson", "telegram")
+READ_CHUNK = 1 << 20
+TELEGRAM_MESSAGES_RE = re.compile(r'"messages"\s*:\s*\[')
+
+Message = tuple[Any, str]
+
+
+def _telegram_text(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        return "".join(x if isinstance(x, str) else str(x.get("text", "")) for x in value)
+    return ""
+
+
+def iter_text_messages(fh: IO[str]) -> Iterator[Message]:
+    """Plain text: one message per setup block, split on the fly."""
+    for i, block in enumerate(iter_setups(fh)):
+        yield i, block
+
+
+def iter_ndjson_messages(fh: IO[str]) -> Iterator[Message]:
+    """NDJSON: each line is a string or an object with ``text`` (and ``id``)."""
+    for lineno, line in enumerate(fh, start=1):
+        if not line.strip():
+            continue
+        row = json.loads(line)
+        if isinstance(row, str):
+            yield lineno, row
+        elif isinstance(row, dict):
+            yield row.get("id", lineno), _telegram_text(row.get("text"))
+
+
+def iter_telegram_messages(fh: IO[str], chunk_size: int = READ_CHUNK) -> Iterator[Message]:
+    """Telegram Desktop JSON export, decoded incrementally from ``messages``."""
+    decoder = json.JSONDecoder()
+    buf = ""
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buf, eof
+        chunk = fh.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buf += chunk
+        return True
+
+    while True:
+        m = TELEGRAM_MESSAGES_RE.search(buf)
+        if m:
+            buf = buf[m.end():]
+            break
+        # keep a tail in case the key straddles two chunks
+        buf = buf[-32:]
+        if not fill():
+            raise ValueError("no \"messages\" array found in Telegram export")
+
+    pos = 0
+    while True:
+        while pos < len(buf) and buf[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= len(buf):
+            buf, pos = "", 0
+            if not fill():
+                raise ValueError("unterminated \"messages\" array in Telegram export")
+            continue
+        if buf[pos] == "]":
+            return
+        try:
+            obj, pos = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            # drop what was consumed before reading more, so the buffer only
+            # ever holds the current message plus one chunk
+            buf, pos = buf[pos:], 0
+            if eof or not fill():
+                raise
+            continue
+        if isinstance(obj, dict) and obj.get("type", "message") == "message":
+            text = _telegram_text(obj.get("text"))
+            if text.strip():
+                yield obj.get("id"), text
+
+
+def detect_format(path: str | None) -> str:
+    suffix = Path(path).suffix.lower() if path and path != "-" else ""
+    if suffix == ".json":
+        return "telegram"
+    if suffix in {".ndjson", ".jsonl"}:
+        return "ndjson"
+    return "text"
+
+
+def iter_messages(fh: IO[str], fmt: str) -> Iterator[Message]:
+    if fmt == "telegram":
+        return iter_telegram_messages(fh)
+    if fmt == "ndjson":
+        return iter_ndjson_messages(fh)
+    return iter_text_messages(fh)
+
+
+def parse_message(message: Message) -> list[dict[str, Any]]:
+    """Records for one message; a parser exception becomes a single ``ERROR`` record."""
+    message_id, text = message
+    try:
+        if may_be_signal(text):
+            results = [parse_block_result(block) for block in split_setups(text) or [text]]
+        else:
+            results = [ParseResult(status="REJECT", confidence=0.0, signal=None, errors=[], warnings=[])]
+    except Exception as exc:
+        error = ParseResult(status="ERROR", confidence=0.0, signal=None, errors=[f"{type(exc).__name__}: {exc}"], warnings=[])
+        return [{"message_id": message_id, "block_index": 0, **error.to_dict()}]
+    return [{"message_id": message_id, "block_index": i, **r.to_dict()} for i, r in enumerate(results)]
+
+
+def _batches(items: Iterable[Message], size: int) -> Iterator[list[Message]]:
+    it = iter(items)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def iter_results(messages: Iterable[Message], jobs: int = 1, batch_size: int = 2048) -> Iterator[list[dict[str, Any]]]:
+    """Parse messages in order, fanning out to ``jobs`` processes when > 1.
+
+    Input is consumed one batch at a time so a fast reader cannot run ahead of
+    the workers.
+    """
+    if jobs <= 1:
+        for message in messages:
+            yield parse_message(message)
+        return
+
+    from multiprocessing import Pool
+
+    with Pool(jobs, initializer=metrics.set_enabled, initargs=(False,)) as pool:
+        for batch in _batches(messages, batch_size):
+            yield from pool.imap(parse_message, batch, chunksize=max(1, len(batch) // (jobs * 4)))
+
+
+class Progress:
+    def __init__(self, stream: IO[str], every_s: float) -> None:
+        self.stream = stream
+        self.every_s = every_s
+        self.started = self._last = time.perf_counter()
+        self.messages = 0
+        self.blocks = 0
+        self.errors = 0
+        self.statuses: Counter[str] = Counter()
+
+    def update(self, records: list[dict[str, Any]]) -> None:
+        self.messages += 1
+        self.blocks += len(records)
+        for r in records:
+            self.statuses[r["status"]] += 1
+        self.errors += sum(1 for r in records if r["status"] == "ERROR")
+        now = time.perf_counter()
+        if self.every_s > 0 and now - self._last >= self.every_s:
+            self._last = now
+            self.report(final=False)
+
+    def report(self, final: bool) -> None:
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        statuses = " ".join(f"{k}={v}" for k, v in sorted(self.statuses.items()))
+        prefix = "done" if final else "progress"
+        print(
+            f"{prefix}: messages={self.messages} blocks={self.blocks} errors={self.errors} "
+            f"{self.messages / elapsed:.0f} msg/s elapsed={elapsed:.1f}s {statuses}",
+            file=self.stream,
+            flush=True,
+        )
+
+
+def run(
+    source: IO[str],
+    sink: IO[bytes],
+    fmt: str = "text",
+    jobs: int = 1,
+    progress: Progress | None = None,
+) -> int:
+    messages = 0
+    for records in iter_results(iter_messages(source, fmt), jobs=jobs):
+        for record in records:
+            sink.write(dumps_json_bytes(record) + b"\n")
+        if progress is not None:
+            progress.update(records)
+        messages += 1
+    sink.flush()
+    return messages
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(prog="python -m src.parser", description="Parse chat exports into NDJSON.")
+    p.add_argument("input", nargs="?", default="-", help="input file, or - for stdin (default)")
+    p.add_argument("-o", "--output", default="-", help="output NDJSON file, or - for stdout (default)")
+    p.add_argument("-f", "--format", choices=FORMATS, default="auto", help="input format (default: by extension)")
+    p.add_argument("-j", "--jobs", type=int, default=1, help="worker processes (default: 1)")
+    p.add_argument("--progress", type=float, default=5.0, metavar="SECONDS", help="progress interval, 0 to disable")
+    return p
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_arg_parser().parse_args(argv)
+    metrics.set_enabled(False)
+    fmt = detect_format(args.input) if args.format == "auto" else args.format
+
+    from_stdin = args.input == "-"
+    to_stdout = args.output == "-"
+    source: IO[str] = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8") if from_stdin else open(args.input, encoding="utf-8")
+    sink: IO[bytes] = sys.stdout.buffer if to_stdout else open(args.output, "wb")
+
+    progress = Progress(sys.stderr, args.progress)
+    try:
+        run(source, sink, fmt=fmt, jobs=args.jobs, progress=progress)
+    finally:
+        if not from_stdin:
+            source.close()
+        if not to_stdout:
+            sink.close()
+    progress.report(final=True)
+    return 0
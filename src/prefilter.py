@@ -0,0 +1,44 @@
+"""Cheap single-pass check that rules out messages the parser would REJECT.
+
+``parse_block`` returns REJECT only when it finds no symbol, side, entry, SL
+or TP. Each of those needs at least one marker below ($/# ticker, side word
+or emoji, SL/TP/entry word), so a text with none of them cannot parse to
+anything else. Keywords are matched as word prefixes over lower-cased,
+homoglyph-normalized text, which only ever widens what the parser's own
+patterns accept.
+"""
+from __future__ import annotations
+
+import re
+
+from src.parser import CYR_TO_LAT
+
+MARKER_CHARS = ("$", "#", "🐂", "🐻")
+KEYWORDS = (
+    # side
+    "long", "short", "лонг", "шорт",
+    # stop loss
+    "sl", "stop", "стоп",
+    # take profit
+    "tp", "тейк", "take",
+    # entry
+    "вход", "entry", "усреднение", "лимитк",
+)
+
+
+def normalize(text: str) -> str:
+    return text.lower().translate(CYR_TO_LAT)
+
+
+def _build_pattern() -> re.Pattern[str]:
+    words = sorted({normalize(k) for k in KEYWORDS}, key=len, reverse=True)
+    chars = "".join(re.escape(c) for c in MARKER_CHARS)
+    return re.compile(r"\b(?:" + "|".join(re.escape(w) for w in words) + r")|[" + chars + "]")
+
+
+CANDIDATE_RE = _build_pattern()
+
+
+def may_be_signal(text: str) -> bool:
+    """False only when the full parser is guaranteed to REJECT ``text``."""
+    return CANDIDATE_RE.search(normalize(text)) is not None
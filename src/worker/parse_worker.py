@@ -1,13 +1,37 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import argparse
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime
 from typing import TYPE_CHECKING, Protocol
 
-from src.parser import parse_block, split_setups
+from src import metrics
+from src.parser import (
+    DEFAULT_TIME_BUDGET_S,
+    ParseResult,
+    UpdateAction,
+    cap_line_length,
+    parse_block_result,
+    parse_update,
+    timed_split_setups,
+)
+from src.prefilter import may_be_signal
+from src.worker.profiling import SignalProfiler, SlowParseRecorder
 
 if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
     from src.db.models import ParsedSignal, RawMessage, SignalStatus
 
+logger = logging.getLogger(__name__)
+
 PARSER_VERSION = "v1"
 
 
@@ -15,6 +39,15 @@ PARSER_VERSION = "v1"
 class RawMessageLike:
     id: int
     text: str
+    chat_id: int | None = None
+    reply_to_message_id: int | None = None
+    trader_id: int | None = None
+
+
+@dataclass
+class LinkedTrade:
+    id: int
+    trader_id: int | None
 
 
 class WorkerRepository(Protocol):
@@ -28,30 +61,278 @@ class WorkerRepository(Protocol):
         errors_json: list[str],
         warnings_json: list[str],
         parser_version: str,
+        trader_id: int | None = None,
     ) -> None: ...
 
 
-def parse_once(repo: WorkerRepository, limit: int = 100) -> int:
+class ReplyRepository(Protocol):
+    def find_reply_trade(self, chat_id: int, message_id: int) -> LinkedTrade | None: ...
+
+    def apply_trade_update(self, trade_id: int, actions: list[UpdateAction], raw_message_id: int) -> None: ...
+
+
+@dataclass
+class StoredSignalLike:
+    id: int
+    status: str
+    payload_json: dict
+    errors_json: list[str]
+    warnings_json: list[str]
+
+
+@dataclass
+class StaleMessage:
+    raw: RawMessageLike
+    signals: list[StoredSignalLike]
+
+
+@dataclass
+class ReparseBatch:
+    touch_ids: list[int] = field(default_factory=list)
+    updates: list[dict] = field(default_factory=list)
+    inserts: list[dict] = field(default_factory=list)
+    delete_ids: list[int] = field(default_factory=list)
+
+
+class ReparseRepository(Protocol):
+    def fetch_stale_messages(self, parser_version: str, after_id: int = 0, limit: int = 500) -> list[StaleMessage]: ...
+
+    def apply_reparse(self, batch: ReparseBatch, parser_version: str) -> None: ...
+
+
+@dataclass
+class ReparseReport:
+    messages: int = 0
+    unchanged: Counter[str] = field(default_factory=Counter)
+    changed: Counter[str] = field(default_factory=Counter)
+    inserted: int = 0
+    deleted: int = 0
+
+    @property
+    def rows_rewritten(self) -> int:
+        return sum(self.changed.values()) + self.inserted + self.deleted
+
+    def summary(self) -> str:
+        lines = [
+            f"messages={self.messages} unchanged={sum(self.unchanged.values())} "
+            f"changed={sum(self.changed.values())} inserted={self.inserted} deleted={self.deleted}"
+        ]
+        lines += [f"  unchanged {status}: {n}" for status, n in sorted(self.unchanged.items())]
+        lines += [f"  changed {transition}: {n}" for transition, n in sorted(self.changed.items())]
+        return "\n".join(lines)
+
+
+def signal_fingerprint(status: str, payload_json: dict, errors_json: list[str], warnings_json: list[str]) -> str:
+    """Stable hash of a parse output, independent of key order."""
+    canonical = json.dumps(
+        [status, payload_json or {}, errors_json or [], warnings_json or []],
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def _message_blocks(text: str, hardened: bool) -> list[str]:
+    text = cap_line_length(text)[0] if hardened else text
+    return timed_split_setups(text) or [text]
+
+
+def _message_deadline(hardened: bool) -> float | None:
+    """One time budget for all blocks of a message, so a digest cannot take N budgets."""
+    return time.perf_counter() + DEFAULT_TIME_BUDGET_S if hardened else None
+
+
+def _prefilter_rejects(text: str, verify: bool, hardened: bool) -> bool:
+    """True when the message can be stored as a single REJECT without parsing.
+
+    In verify mode the full parser still runs and the prefilter is overruled
+    (and counted as a miss) if any block would not be REJECT.
+    """
+    if may_be_signal(text):
+        metrics.PREFILTER_TOTAL.labels("passed").inc()
+        return False
+    if verify:
+        deadline = _message_deadline(hardened)
+        results = [parse_block_result(b, hardened=hardened, deadline=deadline) for b in _message_blocks(text, hardened)]
+        if any(r.status != "REJECT" for r in results):
+            metrics.PREFILTER_MISSES_TOTAL.inc()
+            logger.warning("prefilter would have dropped a %s message: %r", results[0].status, text[:200])
+            return False
+    metrics.PREFILTER_TOTAL.labels("skipped").inc()
+    return True
+
+
+def breakeven_price(entries: list[dict], fills: list[dict]) -> float | None:
+    """Average entry price: filled entries if any, else the planned ones."""
+    prices = [f["price"] for f in fills if f.get("kind") == "entry" and f.get("price") is not None]
+    if not prices:
+        for e in entries:
+            if e.get("type") == "zone" and e.get("price_min") is not None and e.get("price_max") is not None:
+                prices.append((e["price_min"] + e["price_max"]) / 2)
+            elif e.get("price") is not None:
+                prices.append(e["price"])
+    return sum(prices) / len(prices) if prices else None
+
+
+def _apply_reply(repo: ReplyRepository, raw: RawMessageLike) -> tuple[str, dict, list[str]] | None:
+    """Apply a reply that updates its setup's trade.
+
+    None when the text is not an update or the reply's author is not the
+    trade's trader; such messages are parsed like any other.
+    """
+    actions = parse_update(raw.text)
+    if not actions:
+        return None
+    trade = repo.find_reply_trade(raw.chat_id, raw.reply_to_message_id)
+    if trade is not None and trade.trader_id != raw.trader_id:
+        return None
+    trade_id = trade.id if trade is not None else None
+    payload = {
+        "update": {
+            "reply_to_message_id": raw.reply_to_message_id,
+            "trade_id": trade_id,
+            "actions": [a.to_dict() for a in actions],
+        }
+    }
+    if trade_id is None:
+        return "DRAFT", payload, ["reply target has no linked trade"]
+    repo.apply_trade_update(trade_id, actions, raw.id)
+    return "READY", payload, []
+
+
+def _reject_result() -> ParseResult:
+    return ParseResult(status="REJECT", confidence=0.0, signal=None, errors=[], warnings=[])
+
+
+def _error_result(exc: Exception) -> ParseResult:
+    return ParseResult(status="DRAFT", confidence=0.0, signal=None, errors=[f"parser error: {type(exc).__name__}: {exc}"], warnings=[])
+
+
+def _message_results(
+    raw: RawMessageLike,
+    slow_recorder: SlowParseRecorder | None,
+    hardened: bool,
+    prefilter: bool,
+    verify_prefilter: bool,
+) -> list[ParseResult]:
+    if prefilter and _prefilter_rejects(raw.text, verify_prefilter, hardened):
+        return [_reject_result()]
+    results = []
+    deadline = _message_deadline(hardened)
+    for block in _message_blocks(raw.text, hardened):
+        if slow_recorder is None:
+            results.append(parse_block_result(block, hardened=hardened, deadline=deadline))
+            continue
+        timings: dict[str, float] = {}
+        started = time.perf_counter()
+        result = parse_block_result(block, timings=timings, hardened=hardened, deadline=deadline)
+        elapsed = time.perf_counter() - started
+        if slow_recorder.is_slow(elapsed):
+            slow_recorder.record(raw.id, block, result.status, elapsed, timings, PARSER_VERSION)
+        results.append(result)
+    return results
+
+
+def parse_once(
+    repo: WorkerRepository,
+    limit: int = 100,
+    slow_recorder: SlowParseRecorder | None = None,
+    hardened: bool = False,
+    prefilter: bool = True,
+    verify_prefilter: bool = False,
+) -> int:
     handled = 0
     for raw in repo.fetch_unparsed_raw_messages(limit=limit):
-        blocks = split_setups(raw.text)
-        if not blocks:
-            blocks = [raw.text]
+        if raw.reply_to_message_id is not None and raw.chat_id is not None:
+            applied = _apply_reply(repo, raw)
+            if applied is not None:
+                status, payload, errors = applied
+                repo.save_parsed_signal(
+                    raw_message_id=raw.id,
+                    status=status,
+                    payload_json=payload,
+                    errors_json=errors,
+                    warnings_json=[],
+                    parser_version=PARSER_VERSION,
+                    trader_id=raw.trader_id,
+                )
+                metrics.PARSED_SIGNALS_TOTAL.labels(status, PARSER_VERSION).inc()
+                handled += 1
+                continue
 
-        for block in blocks:
-            result = parse_block(block)
+        try:
+            results = _message_results(raw, slow_recorder, hardened, prefilter, verify_prefilter)
+        except Exception as exc:
+            # One bad message must not abort the batch and be refetched first forever.
+            logger.exception("parsing raw message %s failed", raw.id)
+            results = [_error_result(exc)]
+        for result in results:
             repo.save_parsed_signal(
                 raw_message_id=raw.id,
-                status=result["status"],
-                payload_json=result.get("signal") or {},
-                errors_json=result.get("errors") or [],
-                warnings_json=result.get("warnings") or [],
+                status=result.status,
+                payload_json=result.signal.to_dict() if result.signal is not None else {},
+                errors_json=result.errors,
+                warnings_json=result.warnings,
                 parser_version=PARSER_VERSION,
+                trader_id=raw.trader_id,
             )
+            metrics.PARSED_SIGNALS_TOTAL.labels(result.status, PARSER_VERSION).inc()
             handled += 1
     return handled
 
 
+def reparse(repo: ReparseRepository, batch_size: int = 500, hardened: bool = False, prefilter: bool = True) -> ReparseReport:
+    """Re-run the parser over messages parsed by an older ``PARSER_VERSION``.
+
+    Rows whose output hash is unchanged only get ``parser_version`` bumped;
+    changed rows are updated in place, and rows are inserted or deleted only
+    when a message now splits into a different number of blocks.
+    """
+    report = ReparseReport()
+    after_id = 0
+    while True:
+        stale = repo.fetch_stale_messages(PARSER_VERSION, after_id=after_id, limit=batch_size)
+        if not stale:
+            return report
+        batch = ReparseBatch()
+        for msg in stale:
+            report.messages += 1
+            if any("update" in (s.payload_json or {}) for s in msg.signals):
+                # Updates were applied to their trade on the first pass; keep the rows.
+                batch.touch_ids.extend(s.id for s in msg.signals)
+                report.unchanged.update(s.status for s in msg.signals)
+                continue
+            try:
+                results = _message_results(msg.raw, None, hardened, prefilter, verify_prefilter=False)
+            except Exception as exc:
+                logger.exception("re-parsing raw message %s failed", msg.raw.id)
+                results = [_error_result(exc)]
+            for i, result in enumerate(results):
+                row = {
+                    "status": result.status,
+                    "payload_json": result.signal.to_dict() if result.signal is not None else {},
+                    "errors_json": result.errors,
+                    "warnings_json": result.warnings,
+                }
+                if i >= len(msg.signals):
+                    batch.inserts.append({"raw_message_id": msg.raw.id, **row})
+                    report.inserted += 1
+                    continue
+                old = msg.signals[i]
+                if signal_fingerprint(old.status, old.payload_json, old.errors_json, old.warnings_json) == signal_fingerprint(**row):
+                    batch.touch_ids.append(old.id)
+                    report.unchanged[result.status] += 1
+                else:
+                    batch.updates.append({"id": old.id, **row})
+                    report.changed[f"{old.status}->{result.status}"] += 1
+            extra = [s.id for s in msg.signals[len(results):]]
+            batch.delete_ids.extend(extra)
+            report.deleted += len(extra)
+        repo.apply_reparse(batch, PARSER_VERSION)
+        after_id = stale[-1].raw.id
+
+
 class SqlAlchemyWorkerRepository:
     def fetch_unparsed_raw_messages(self, limit: int = 100) -> list[RawMessageLike]:
         from src.db.models import ParsedSignal, RawMessage
@@ -66,7 +347,16 @@ class SqlAlchemyWorkerRepository:
                 .limit(limit)
                 .all()
             )
-            return [RawMessageLike(id=row.id, text=row.text) for row in rows]
+            return [
+                RawMessageLike(
+                    id=row.id,
+                    text=row.text,
+                    chat_id=row.chat_id,
+                    reply_to_message_id=row.reply_to_message_id,
+                    trader_id=row.trader_id,
+                )
+                for row in rows
+            ]
 
     def save_parsed_signal(
         self,
@@ -76,27 +366,292 @@ class SqlAlchemyWorkerRepository:
         errors_json: list[str],
         warnings_json: list[str],
         parser_version: str,
+        trader_id: int | None = None,
     ) -> None:
         from src.db.models import ParsedSignal, SignalStatus
+        from src.db.notify import notify_event
+        from src.db.session import SessionLocal
+
+        with metrics.DB_WRITE_SECONDS.labels("save_parsed_signal").time(), SessionLocal() as db:
+            signal = ParsedSignal(
+                raw_message_id=raw_message_id,
+                status=SignalStatus(status),
+                payload_json=payload_json,
+                errors_json=errors_json,
+                warnings_json=warnings_json,
+                parser_version=parser_version,
+            )
+            db.add(signal)
+            if status != "REJECT":
+                db.flush()
+                notify_event(
+                    db,
+                    {
+                        "type": "parsed_signal",
+                        "id": signal.id,
+                        "raw_message_id": raw_message_id,
+                        "trader_id": trader_id,
+                        "status": status,
+                        "parser_version": parser_version,
+                        "data": payload_json,
+                    },
+                )
+            db.commit()
+
+    def find_reply_trade(self, chat_id: int, message_id: int, max_hops: int = 5) -> LinkedTrade | None:
+        """Trade created from the message replied to, following reply-to-reply chains."""
+        from sqlalchemy import select
+
+        from src.db.models import RawMessage, Trade
         from src.db.session import SessionLocal
 
         with SessionLocal() as db:
-            db.add(
-                ParsedSignal(
-                    raw_message_id=raw_message_id,
-                    status=SignalStatus(status),
-                    payload_json=payload_json,
-                    errors_json=errors_json,
-                    warnings_json=warnings_json,
-                    parser_version=parser_version,
+            for _ in range(max_hops):
+                row = (
+                    db.query(RawMessage.id, RawMessage.reply_to_message_id)
+                    .filter(RawMessage.chat_id == chat_id, RawMessage.message_id == message_id)
+                    .order_by(RawMessage.id.desc())
+                    .first()
                 )
+                if row is None:
+                    return None
+                trade = db.execute(
+                    select(Trade.id, Trade.trader_id).where(Trade.raw_message_id == row.id).order_by(Trade.id.asc()).limit(1)
+                ).first()
+                if trade is not None:
+                    return LinkedTrade(id=trade.id, trader_id=trade.trader_id)
+                if row.reply_to_message_id is None:
+                    return None
+                message_id = row.reply_to_message_id
+            return None
+
+    def apply_trade_update(self, trade_id: int, actions: list[UpdateAction], raw_message_id: int) -> None:
+        from sqlalchemy import select
+
+        from src.db.models import RawMessage, Trade, TradeStatus
+        from src.db.notify import notify_event
+        from src.db.session import SessionLocal
+
+        with metrics.DB_WRITE_SECONDS.labels("apply_trade_update").time(), SessionLocal() as db:
+            trade = db.get(Trade, trade_id)
+            if trade is None:
+                return
+            # Only the trade's own trader can update it.
+            if db.scalar(select(RawMessage.trader_id).where(RawMessage.id == raw_message_id)) != trade.trader_id:
+                return
+            fills = list(trade.fills_json or [])
+            # Fills carry their source message, so a retried message is applied once.
+            if any(f.get("raw_message_id") == raw_message_id for f in fills):
+                return
+            ts = datetime.utcnow().timestamp()
+            new_fills = []
+            for action in actions:
+                price = action.price
+                if action.kind == "move_sl":
+                    price = breakeven_price(trade.entries_json or [], fills) if action.breakeven else action.price
+                    if price is None:
+                        continue
+                    trade.sl = price
+                elif action.kind in ("close", "cancel"):
+                    trade.status = TradeStatus.CLOSED
+                new_fills.append({"kind": action.kind, "price": price, "pct": action.pct, "raw_message_id": raw_message_id, "ts": ts})
+            trade.fills_json = fills + new_fills
+            notify_event(
+                db,
+                {
+                    "type": "trade",
+                    "id": trade.id,
+                    "trader_id": trade.trader_id,
+                    "status": trade.status.value,
+                    "data": {"sl": trade.sl, "fills": new_fills},
+                },
             )
             db.commit()
 
+    def fetch_stale_messages(self, parser_version: str, after_id: int = 0, limit: int = 500) -> list[StaleMessage]:
+        from src.db.models import ParsedSignal, RawMessage
+        from src.db.session import SessionLocal
+
+        with SessionLocal() as db:
+            raw_rows = (
+                db.query(RawMessage.id, RawMessage.text, RawMessage.chat_id, RawMessage.reply_to_message_id)
+                .filter(
+                    RawMessage.id > after_id,
+                    RawMessage.id.in_(
+                        db.query(ParsedSignal.raw_message_id).filter(ParsedSignal.parser_version != parser_version)
+                    ),
+                )
+                .order_by(RawMessage.id.asc())
+                .limit(limit)
+                .all()
+            )
+            by_raw: dict[int, StaleMessage] = {
+                raw_id: StaleMessage(
+                    raw=RawMessageLike(id=raw_id, text=text, chat_id=chat_id, reply_to_message_id=reply_to), signals=[]
+                )
+                for raw_id, text, chat_id, reply_to in raw_rows
+            }
+            signals = (
+                db.query(ParsedSignal)
+                .filter(ParsedSignal.raw_message_id.in_(list(by_raw)))
+                .order_by(ParsedSignal.raw_message_id.asc(), ParsedSignal.id.asc())
+                .all()
+            )
+            for sig in signals:
+                by_raw[sig.raw_message_id].signals.append(
+                    StoredSignalLike(
+                        id=sig.id,
+                        status=sig.status.value,
+                        payload_json=sig.payload_json,
+                        errors_json=sig.errors_json,
+                        warnings_json=sig.warnings_json,
+                    )
+                )
+            return list(by_raw.values())
+
+    def apply_reparse(self, batch: ReparseBatch, parser_version: str) -> None:
+        from sqlalchemy import delete, insert, update
+
+        from src.db.models import ParsedSignal, SignalStatus
+        from src.db.notify import notify_event
+        from src.db.session import SessionLocal
+
+        with metrics.DB_WRITE_SECONDS.labels("apply_reparse").time(), SessionLocal() as db:
+            if batch.touch_ids:
+                db.execute(
+                    update(ParsedSignal).where(ParsedSignal.id.in_(batch.touch_ids)).values(parser_version=parser_version)
+                )
+            if batch.updates:
+                db.execute(
+                    update(ParsedSignal),
+                    [{**row, "status": SignalStatus(row["status"]), "parser_version": parser_version} for row in batch.updates],
+                )
+            if batch.inserts:
+                db.execute(
+                    insert(ParsedSignal),
+                    [
+                        {**row, "status": SignalStatus(row["status"]), "parser_version": parser_version, "ts": datetime.utcnow()}
+                        for row in batch.inserts
+                    ],
+                )
+            if batch.delete_ids:
+                db.execute(delete(ParsedSignal).where(ParsedSignal.id.in_(batch.delete_ids)))
+            if batch.touch_ids or batch.updates or batch.inserts or batch.delete_ids:
+                # Bulk statements skip the ORM version listeners; an event with no
+                # trader invalidates every cached scope in the API.
+                notify_event(
+                    db,
+                    {
+                        "type": "reparse",
+                        "trader_id": None,
+                        "parser_version": parser_version,
+                        "data": {
+                            "touched": len(batch.touch_ids),
+                            "updated": len(batch.updates),
+                            "inserted": len(batch.inserts),
+                            "deleted": len(batch.delete_ids),
+                        },
+                    },
+                )
+            db.commit()
+
+    def unparsed_backlog(self) -> tuple[int, datetime | None]:
+        from sqlalchemy import func
+
+        from src.db.models import ParsedSignal, RawMessage
+        from src.db.session import SessionLocal
+
+        with SessionLocal() as db:
+            count, oldest = (
+                db.query(func.count(RawMessage.id), func.min(RawMessage.ts))
+                .outerjoin(ParsedSignal, ParsedSignal.raw_message_id == RawMessage.id)
+                .filter(ParsedSignal.id.is_(None))
+                .one()
+            )
+            return int(count), oldest
+
 
-def main() -> int:
+def register_backlog_collector(repo: SqlAlchemyWorkerRepository, registry: metrics.Registry = metrics.REGISTRY) -> None:
+    def collect() -> None:
+        count, oldest = repo.unparsed_backlog()
+        metrics.RAW_BACKLOG.set(count)
+        metrics.RAW_BACKLOG_OLDEST_AGE.set((datetime.utcnow() - oldest).total_seconds() if oldest else 0.0)
+
+    registry.add_collector(collect)
+
+
+def serve_metrics(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Expose the metrics registry for scraping from a daemon thread."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 - http.server API
+            body = metrics.REGISTRY.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", metrics.CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:
+            return
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def push_metrics(gateway_url: str, job: str = "parse_worker") -> None:
+    """Push the registry to a Prometheus Pushgateway; used by short cron runs."""
+    import urllib.request
+
+    req = urllib.request.Request(
+        f"{gateway_url.rstrip('/')}/metrics/job/{job}",
+        data=metrics.REGISTRY.render().encode("utf-8"),
+        method="PUT",
+        headers={"Content-Type": metrics.CONTENT_TYPE},
+    )
+    with urllib.request.urlopen(req, timeout=5):
+        pass
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.worker.parse_worker")
+    parser.add_argument(
+        "--reparse",
+        action="store_true",
+        help=f"re-parse messages from older parser versions into {PARSER_VERSION}, writing only changed rows",
+    )
+    args = parser.parse_args(argv)
+
+    hardened = bool(os.getenv("PARSER_HARDENED"))
+    prefilter = os.getenv("PARSER_PREFILTER", "1").lower() not in {"0", "false", "no", "off"}
     repo = SqlAlchemyWorkerRepository()
-    return parse_once(repo)
+    if args.reparse:
+        report = reparse(repo, hardened=hardened, prefilter=prefilter)
+        print(report.summary())
+        return sum(report.unchanged.values()) + report.rows_rewritten
+
+    if metrics.enabled():
+        register_backlog_collector(repo)
+        if os.getenv("METRICS_PORT"):
+            serve_metrics(int(os.environ["METRICS_PORT"]))
+    profiler = None
+    if os.getenv("PARSE_PROFILE_SIGNAL"):
+        profiler = SignalProfiler(os.getenv("PARSE_PROFILE_DIR", "profiles"))
+        profiler.install()
+    processed = parse_once(
+        repo,
+        slow_recorder=SlowParseRecorder.from_env(),
+        hardened=hardened,
+        prefilter=prefilter,
+        verify_prefilter=bool(os.getenv("PARSER_PREFILTER_VERIFY")),
+    )
+    if profiler is not None and profiler.active:
+        profiler.toggle()
+    if metrics.enabled() and os.getenv("METRICS_PUSHGATEWAY_URL"):
+        push_metrics(os.environ["METRICS_PUSHGATEWAY_URL"])
+    return processed
 
 
 if __name__ == "__main__":
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import cProfile
+import json
+import os
+import signal
+import time
+from datetime import datetime
+from pathlib import Path
+
+DEFAULT_SLOW_LOG = "slow_parses.ndjson"
+DEFAULT_PROFILE_DIR = "profiles"
+
+
+class SlowParseRecorder:
+    """Append blocks whose parse exceeded ``threshold_ms`` to an NDJSON file.
+
+    Each line keeps the raw block text so it can be copied into the fixture
+    corpus as-is.
+    """
+
+    def __init__(self, threshold_ms: float, path: str | Path = DEFAULT_SLOW_LOG) -> None:
+        self.threshold_ms = threshold_ms
+        self.path = Path(path)
+        self.recorded = 0
+
+    @classmethod
+    def from_env(cls) -> SlowParseRecorder | None:
+        threshold = os.getenv("PARSE_SLOW_MS")
+        if not threshold:
+            return None
+        return cls(float(threshold), os.getenv("PARSE_SLOW_LOG", DEFAULT_SLOW_LOG))
+
+    def is_slow(self, elapsed_s: float) -> bool:
+        return elapsed_s * 1000 >= self.threshold_ms
+
+    def record(
+        self,
+        raw_message_id: int,
+        block: str,
+        status: str,
+        elapsed_s: float,
+        timings: dict[str, float],
+        parser_version: str,
+    ) -> None:
+        row = {
+            "ts": datetime.utcnow().isoformat(),
+            "raw_message_id": raw_message_id,
+            "parser_version": parser_version,
+            "status": status,
+            "total_ms": round(elapsed_s * 1000, 3),
+            "stages_ms": {k: round(v * 1000, 3) for k, v in timings.items()},
+            "block_len": len(block),
+            "block": block,
+        }
+        with self.path.open("a", encoding="utf-8") as fh:
+            fh.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self.recorded += 1
+
+
+class SignalProfiler:
+    """Toggle a cProfile session with a signal (SIGUSR1 by default).
+
+    The first signal starts profiling, the next one stops it and dumps
+    ``pstats`` data into ``out_dir``.
+    """
+
+    def __init__(self, out_dir: str | Path = DEFAULT_PROFILE_DIR) -> None:
+        self.out_dir = Path(out_dir)
+        self._profile: cProfile.Profile | None = None
+        self.dumps: list[Path] = []
+
+    def install(self, signum: int = signal.SIGUSR1) -> None:
+        signal.signal(signum, self._handle)
+
+    def _handle(self, signum: int, frame: object) -> None:
+        self.toggle()
+
+    @property
+    def active(self) -> bool:
+        return self._profile is not None
+
+    def toggle(self) -> Path | None:
+        if self._profile is None:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+            return None
+        self._profile.disable()
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        path = self.out_dir / f"parse_worker_{os.getpid()}_{time.strftime('%Y%m%dT%H%M%S')}.pstats"
+        self._profile.dump_stats(str(path))
+        self._profile = None
+        self.dumps.append(path)
+        return path
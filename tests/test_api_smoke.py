@@ -7,17 +7,26 @@ pytest.importorskip("sqlalchemy")
 
 from datetime import datetime
 
+from fastapi import Request
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
+from src.api.auth import identity_cache, issue_token
+import src.api.main as api_main
 from src.api.main import app
+from src.api.rbac import CurrentUser
+from src.api.response_cache import ResponseCache, response_cache
+from src.db.versions import DataVersions, data_versions
 from src.db.models import Base, Trade, TradeStatus, Trader, User, UserRole
 from src.db.session import get_db
 
 
-def _make_client() -> TestClient:
+def _make_client(monkeypatch: pytest.MonkeyPatch) -> TestClient:
+    monkeypatch.setenv("API_AUTH_SECRET", "test-secret")
+    identity_cache.clear()
+    response_cache.clear()
     engine = create_engine(
         "sqlite+pysqlite:///:memory:",
         future=True,
@@ -60,15 +69,108 @@ def _make_client() -> TestClient:
     return TestClient(app)
 
 
-def test_trades_smoke_200() -> None:
-    client = _make_client()
-    res = client.get("/trades", headers={"X-Role": "TRADER", "X-Telegram-User-Id": "1001"})
+def _auth(telegram_user_id: int = 1001) -> dict[str, str]:
+    return {"Authorization": f"Bearer {issue_token(telegram_user_id)}"}
+
+
+def test_trades_smoke_200(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = _make_client(monkeypatch)
+    res = client.get("/trades", headers=_auth())
     assert res.status_code == 200
     assert "items" in res.json()
 
 
-def test_metrics_smoke_200() -> None:
-    client = _make_client()
-    res = client.get("/metrics", headers={"X-Role": "TRADER", "X-Telegram-User-Id": "1001"})
+def test_metrics_smoke_200(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = _make_client(monkeypatch)
+    res = client.get("/metrics", headers=_auth())
     assert res.status_code == 200
     assert "kpi" in res.json()
+
+
+def test_unverified_headers_are_rejected(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = _make_client(monkeypatch)
+    res = client.get("/trades", headers={"X-Role": "ADMIN", "X-Telegram-User-Id": "1001"})
+    assert res.status_code == 401
+
+
+def test_access_token_query_is_only_accepted_on_stream(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = _make_client(monkeypatch)
+    res = client.get(f"/trades?access_token={issue_token(1001)}")
+    assert res.status_code == 401
+
+
+def test_stream_releases_db_session_before_streaming(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = _make_client(monkeypatch)
+    events: list[str] = []
+    session_factory = app.dependency_overrides[get_db]
+
+    def tracking_get_db():
+        events.append("open")
+        yield from session_factory()
+        events.append("closed")
+
+    async def one_event(sub, is_disconnected):
+        events.append("streaming")
+        api_main.broker.unsubscribe(sub)
+        yield ": connected\n\n"
+
+    app.dependency_overrides[get_db] = tracking_get_db
+    monkeypatch.setattr(api_main, "sse_events", one_event)
+    res = client.get(f"/stream?access_token={issue_token(1001)}")
+
+    assert res.status_code == 200
+    assert events == ["open", "closed", "streaming"]
+
+
+def test_unknown_user_is_forbidden(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = _make_client(monkeypatch)
+    res = client.get("/trades", headers=_auth(4242))
+    assert res.status_code == 403
+
+
+def test_trades_etag_returns_304_while_body_is_unchanged(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = _make_client(monkeypatch)
+    first = client.get("/trades", headers=_auth())
+    etag = first.headers["etag"]
+
+    cached = client.get("/trades", headers={**_auth(), "If-None-Match": etag})
+    assert cached.status_code == 304
+
+    data_versions.bump(None)
+    rebuilt = client.get("/trades", headers={**_auth(), "If-None-Match": etag})
+    assert rebuilt.status_code == 304
+    assert rebuilt.headers["etag"] == etag
+
+
+def _request(if_none_match: str | None = None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/trades", "query_string": b"", "headers": headers})
+
+
+def test_response_cache_rebuilds_on_bump_and_isolates_trader_scopes() -> None:
+    versions = DataVersions()
+    cache = ResponseCache(versions)
+    alice = CurrentUser(telegram_user_id=1, role="TRADER", trader_id=1)
+    bob = CurrentUser(telegram_user_id=2, role="TRADER", trader_id=2)
+    rows = {1: ["a1"], 2: ["b1"]}
+    builds: list[int] = []
+
+    def build_for(trader_id: int):
+        def build() -> dict:
+            builds.append(trader_id)
+            return {"items": list(rows[trader_id])}
+
+        return build
+
+    alice_etag = cache.respond(_request(), alice, build_for(1)).headers["etag"]
+    bob_etag = cache.respond(_request(), bob, build_for(2)).headers["etag"]
+
+    rows[1].append("a2")
+    versions.bump(1)
+    rebuilt = cache.respond(_request(alice_etag), alice, build_for(1))
+    assert rebuilt.status_code == 200
+    assert rebuilt.headers["etag"] != alice_etag
+    assert b"a2" in rebuilt.body
+
+    assert cache.respond(_request(bob_etag), bob, build_for(2)).status_code == 304
+    assert builds == [1, 2, 1]
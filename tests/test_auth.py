@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+from urllib.parse import urlencode
+
+import pytest
+
+from src.api.auth import AuthError, issue_token, verify_telegram_login, verify_token
+from src.api.cache import TTLCache
+
+
+@pytest.fixture(autouse=True)
+def _secret(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("API_AUTH_SECRET", "test-secret")
+
+
+def test_token_round_trip_and_tampering() -> None:
+    token = issue_token(1001, now=1_000)
+
+    assert verify_token(token, now=1_001) == 1001
+    with pytest.raises(AuthError):
+        verify_token(token.replace("1001.", "1002.", 1), now=1_001)
+    with pytest.raises(AuthError):
+        verify_token(token, now=10**10)
+
+
+def test_telegram_login_payload_is_verified() -> None:
+    fields = {"id": "1001", "first_name": "A", "auth_date": "1000"}
+    data_check = "\n".join(f"{k}={v}" for k, v in sorted(fields.items()))
+    digest = hmac.new(hashlib.sha256(b"bot-token").digest(), data_check.encode(), hashlib.sha256).hexdigest()
+    payload = urlencode({**fields, "hash": digest})
+
+    assert verify_telegram_login(payload, bot_token="bot-token", now=1_100) == 1001
+    with pytest.raises(AuthError):
+        verify_telegram_login(payload.replace("1001", "1002"), bot_token="bot-token", now=1_100)
+
+
+def test_ttl_cache_expires_evicts_and_invalidates() -> None:
+    now = [0.0]
+    cache: TTLCache[int, str] = TTLCache(maxsize=2, ttl_s=10, clock=lambda: now[0])
+    cache.set(1, "a")
+    cache.set(2, "b")
+    cache.get(1)
+    cache.set(3, "c")
+
+    assert cache.get(2) is None
+    assert cache.get(1) == "a"
+    cache.invalidate(1)
+    assert cache.get(1) is None
+    now[0] = 11.0
+    assert cache.get(3) is None
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import pytest
+
+from src import metrics
+from src.parser import parse_block_result
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    registry = metrics.Registry()
+    hist = metrics.Histogram("t_seconds", "test", ("stage",), buckets=(0.1, 1.0), registry=registry)
+
+    hist.labels("entry").observe(0.05)
+    hist.labels("entry").observe(0.5)
+    hist.labels("entry").observe(5.0)
+
+    text = registry.render()
+    assert 't_seconds_bucket{stage="entry",le="0.1"} 1' in text
+    assert 't_seconds_bucket{stage="entry",le="1"} 2' in text
+    assert 't_seconds_bucket{stage="entry",le="+Inf"} 3' in text
+    assert 't_seconds_count{stage="entry"} 3' in text
+
+
+def test_disabled_metrics_record_nothing() -> None:
+    registry = metrics.Registry()
+    counter = metrics.Counter("t_total", "test", ("status",), registry=registry)
+    metrics.set_enabled(False)
+    try:
+        counter.labels("READY").inc()
+    finally:
+        metrics.set_enabled(True)
+
+    assert counter.labels("READY").value == 0
+
+
+def test_parse_block_result_reports_stage_timings() -> None:
+    timings: dict[str, float] = {}
+    parse_block_result("$BTCUSDT - SHORT\nВход 67900\nStop 68700\nTP 67000", timings=timings)
+
+    assert set(timings) == {"symbol", "sl_tp", "entry", "allocations", "validate"}
+    assert all(v >= 0 for v in timings.values())
+
+
+def test_api_exports_request_latency() -> None:
+    pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+
+    from src.api.main import app
+
+    client = TestClient(app)
+    assert client.get("/health").status_code == 200
+
+    resp = client.get("/internal/metrics")
+    assert resp.status_code == 200
+    assert 'journal_api_request_seconds_count{method="GET",route="/health",status="200"}' in resp.text
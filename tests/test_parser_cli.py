@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import io
+import json
+
+from src.parser import split_setups
+from src.parser_cli import iter_ndjson_messages, iter_telegram_messages, run
+
+SETUP = "$BTCUSDT - SHORT\nВход лимитка 67900\nStop 68700\nTейк-профит\n1) 67000"
+
+
+def test_telegram_export_is_decoded_incrementally() -> None:
+    export = {
+        "name": "channel",
+        "messages": [
+            {"id": 1, "type": "message", "text": SETUP},
+            {"id": 2, "type": "service", "text": ""},
+            {"id": 3, "type": "message", "text": ["$ETH", {"type": "bold", "text": "USDT long"}]},
+        ],
+    }
+    fh = io.StringIO(json.dumps(export, ensure_ascii=False, indent=2))
+
+    messages = list(iter_telegram_messages(fh, chunk_size=7))
+
+    assert messages == [(1, SETUP), (3, "$ETHUSDT long")]
+
+
+def test_ndjson_accepts_strings_and_objects() -> None:
+    fh = io.StringIO('{"id": 10, "text": "a"}\n\n"b"\n')
+
+    assert list(iter_ndjson_messages(fh)) == [(10, "a"), (3, "b")]
+
+
+def test_run_writes_one_ndjson_record_per_block() -> None:
+    text = open("fixtures/setups_samples.txt", encoding="utf-8").read()
+    sink = io.BytesIO()
+
+    processed = run(io.StringIO(text), sink, fmt="text")
+
+    records = [json.loads(x) for x in sink.getvalue().splitlines()]
+    assert processed == len(records) == len(split_setups(text))
+    assert records[0]["signal"]["symbol"] == "SOLUSDT"
+
+
+def test_run_writes_error_record_and_continues(monkeypatch) -> None:
+    import src.parser_cli as cli
+
+    real_parse = cli.parse_block_result
+
+    def flaky_parse(block: str):
+        if "boom" in block:
+            raise TypeError("boom")
+        return real_parse(block)
+
+    monkeypatch.setattr(cli, "parse_block_result", flaky_parse)
+    sink = io.BytesIO()
+    progress = cli.Progress(io.StringIO(), every_s=0)
+
+    processed = run(io.StringIO('{"id": 1, "text": "$BTCUSDT boom"}\n' + json.dumps({"id": 2, "text": SETUP}) + "\n"), sink, fmt="ndjson", progress=progress)
+
+    records = [json.loads(x) for x in sink.getvalue().splitlines()]
+    assert processed == 2
+    assert [(r["message_id"], r["status"]) for r in records] == [(1, "ERROR"), (2, "READY")]
+    assert records[0]["errors"] == ["TypeError: boom"]
+    assert progress.errors == 1
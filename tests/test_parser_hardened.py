@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import time
+
+from src.parser import MAX_LINE_LEN, parse_block, parse_block_result, parse_text
+
+READY_TEXT = "$BTCUSDT - SHORT\nВход лимитка 67900\nStop 68700\nTейк-профит\n1) 67000"
+
+
+def test_adversarial_lines_parse_quickly() -> None:
+    started = time.perf_counter()
+    parse_text("вход " + "1 " * 20_000)
+    parse_text("вход 1\n" + " " * 20_000 + "x")
+    parse_text("$BTCUSDT long\n" + "1" * 20_000)
+
+    assert time.perf_counter() - started < 1.0
+
+
+def test_hardened_mode_matches_default_on_normal_input() -> None:
+    assert parse_block_result(READY_TEXT, hardened=True).to_dict() == parse_block(READY_TEXT)
+
+
+def test_hardened_mode_truncates_long_lines() -> None:
+    result = parse_block_result(READY_TEXT + "\n" + "x" * (MAX_LINE_LEN + 10), hardened=True)
+
+    assert result.status == "READY"
+    assert f"lines truncated to {MAX_LINE_LEN} characters" in result.warnings
+
+
+def test_passed_deadline_degrades_to_draft() -> None:
+    result = parse_block_result(READY_TEXT, hardened=True, deadline=time.perf_counter())
+
+    assert result.status == "DRAFT"
+    assert "parse time budget exceeded" in result.warnings
+    assert result.signal is not None and result.signal.symbol == "BTCUSDT"
+
+
+def test_setup_without_stop_loss_is_draft_not_an_error() -> None:
+    for hardened in (False, True):
+        result = parse_block_result("$BTCUSDT short\nвход 100\ntp 90", hardened=hardened)
+        assert result.status == "DRAFT"
+        assert "directional validation conflict" not in result.errors
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import json
+
+from src.jsonutil import dumps_json
+from src.parser import Entry, ParseResult, parse_block, parse_block_result
+
+TEXT = "$BTCUSDT - SHORT\nВход лимитка 67900\nStop 68700\nTейк-профит\n1) 67000"
+
+
+def test_result_types_are_slotted() -> None:
+    result = parse_block_result(TEXT)
+
+    assert isinstance(result, ParseResult)
+    assert not hasattr(result, "__dict__")
+    assert not hasattr(result.signal, "__dict__")
+    assert result.signal.entry == Entry(type="limit", price=67900.0)
+
+
+def test_to_dict_matches_parse_block_and_json_round_trips() -> None:
+    result = parse_block_result(TEXT)
+
+    assert result.to_dict() == parse_block(TEXT)
+    assert json.loads(result.to_json()) == parse_block(TEXT)
+    assert json.loads(dumps_json(result.to_dict())) == parse_block(TEXT)
+
+
+def test_zone_entry_serializes_bounds_only() -> None:
+    assert Entry(type="zone", price_min=1.0, price_max=2.0).to_dict() == {
+        "type": "zone",
+        "price_min": 1.0,
+        "price_max": 2.0,
+    }
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import pytest
+
+from src.parser import UpdateAction, load_fixture, parse_update
+
+
+def test_parse_update_recognises_follow_up_actions() -> None:
+    assert parse_update("Переносим стоп на 2100") == [UpdateAction("move_sl", price=2100.0)]
+    assert parse_update("закрыл 50%, стоп в БУ") == [
+        UpdateAction("partial_close", pct=50.0),
+        UpdateAction("move_sl", breakeven=True),
+    ]
+    assert parse_update("sl to BE; close 30%") == [UpdateAction("move_sl", breakeven=True), UpdateAction("partial_close", pct=30.0)]
+    assert parse_update("фиксирую 100%") == [UpdateAction("close")]
+    assert parse_update("выбило по стопу") == [UpdateAction("close")]
+    assert parse_update("Отмена, неактуально") == [UpdateAction("cancel")]
+    assert parse_update("moved SL to 2050") == [UpdateAction("move_sl", price=2050.0)]
+    assert parse_update("стоп переносим в безубыток") == [UpdateAction("move_sl", breakeven=True)]
+
+
+@pytest.mark.parametrize(
+    ("text", "pct"),
+    [
+        ("закрыл часть", None),
+        ("закрываю половину", 50.0),
+        ("скинул половину", 50.0),
+        ("частично закрыл", None),
+        ("close half", 50.0),
+        ("Закрыл 1/2", 50.0),
+        ("закрыл первую часть по тп1", None),
+    ],
+)
+def test_parse_update_treats_half_and_part_closes_as_partial(text: str, pct: float | None) -> None:
+    assert parse_update(text) == [UpdateAction("partial_close", pct=pct)]
+
+
+def test_parse_update_keeps_actions_after_a_close_in_the_same_segment() -> None:
+    assert parse_update("закрыл половину позиции, стоп в бу") == [
+        UpdateAction("partial_close", pct=50.0),
+        UpdateAction("move_sl", breakeven=True),
+    ]
+    assert parse_update("закрыл, стоп в бу") == [UpdateAction("close"), UpdateAction("move_sl", breakeven=True)]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "не закрываем, держим",
+        "не выбило, держим",
+        "закреплю сообщение",
+        "Closer look at ETH",
+        "стоп не трогаем, цель 2100",
+        "фиксированный риск 1%",
+        "отменил ордер на усреднение",
+        "не переносим стоп на 2100",
+        "стоп на 1%",
+    ],
+)
+def test_parse_update_ignores_negations_and_lookalike_words(text: str) -> None:
+    assert parse_update(text) == []
+
+
+def test_parse_update_ignores_chatter_and_new_setups() -> None:
+    assert parse_update("всем привет") == []
+    first_setup = load_fixture("fixtures/setups_samples.txt").split("\n\n\n")[0]
+    assert parse_update(first_setup) == []
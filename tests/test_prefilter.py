@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import random
+
+from src.parser import parse_block, split_setups
+from src.prefilter import may_be_signal
+from src.worker.parse_worker import RawMessageLike, parse_once
+
+FIXTURE_TEXT = open("fixtures/setups_samples.txt", encoding="utf-8").read()
+VOCAB = [
+    "привет", "gm", "рынок", "BTC", "btcusdt", "67900", "0,5%", "1)", "(1/3)", "-", "\n", " ",
+    "Stop", "СТОП", "sl", "tp2", "Tейк", "тейк профит", "take profit", "вход", "Entry", "лимитка",
+    "long", "SHORT", "лонг", "шорт", "$", "#", "🐂", "🐻", "trader", "усреднение", "рынку",
+]
+
+
+def test_chatter_is_ruled_out() -> None:
+    for text in ["привет всем", "gm, how's the market?", "ок, держим", ""]:
+        assert not may_be_signal(text)
+
+
+def test_every_fixture_setup_passes() -> None:
+    assert all(may_be_signal(block) for block in split_setups(FIXTURE_TEXT))
+
+
+def test_prefilter_never_drops_what_the_parser_accepts() -> None:
+    rng = random.Random(33)
+    for _ in range(5000):
+        text = " ".join(rng.choice(VOCAB) for _ in range(rng.randint(1, 8)))
+        if not may_be_signal(text):
+            assert all(parse_block(b)["status"] == "REJECT" for b in split_setups(text) or [text]), text
+
+
+class _Repo:
+    def __init__(self, texts: list[str]) -> None:
+        self._messages = [RawMessageLike(id=i, text=t) for i, t in enumerate(texts, start=1)]
+        self.saved: list[tuple[int, str, dict]] = []
+
+    def fetch_unparsed_raw_messages(self, limit: int = 100) -> list[RawMessageLike]:
+        return self._messages[:limit]
+
+    def save_parsed_signal(self, raw_message_id, status, payload_json, errors_json, warnings_json, parser_version, trader_id=None) -> None:
+        self.saved.append((raw_message_id, status, payload_json))
+
+
+def test_worker_stores_reject_for_prefiltered_chatter() -> None:
+    repo = _Repo(["всем привет", "$ETHUSDT long\nentry 100\nsl 90\ntp 120"])
+
+    assert parse_once(repo, verify_prefilter=True) == 2
+    assert repo.saved[0] == (1, "REJECT", {})
+    assert repo.saved[1][2]["symbol"] == "ETHUSDT"
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+from src.monitor.levels import Level, SymbolLevels
+from src.monitor.price_monitor import (
+    MonitoredTrade,
+    PriceMonitor,
+    SymbolSubscription,
+    Tick,
+    entry_trigger_price,
+    live_ticks,
+    replay_ticks,
+    run_monitor,
+)
+
+
+def test_crossed_returns_levels_in_path_order_with_half_open_bounds() -> None:
+    levels = SymbolLevels()
+    for price in (10.0, 20.0, 30.0):
+        levels.add(Level(price, 1, "tp"))
+
+    assert [lv.price for lv in levels.crossed(10.0, 30.0)] == [20.0, 30.0]
+    assert [lv.price for lv in levels.crossed(30.0, 10.0)] == [20.0, 10.0]
+    assert levels.crossed(15.0, 15.0) == []
+
+
+def test_entry_trigger_price_uses_near_zone_edge() -> None:
+    zone = {"type": "zone", "price_min": 1.0, "price_max": 2.0}
+    assert entry_trigger_price(zone, "long") == 2.0
+    assert entry_trigger_price(zone, "short") == 1.0
+    assert entry_trigger_price({"type": "market"}, "long") is None
+
+
+def _long(trade_id: int = 1, fills: list | None = None) -> MonitoredTrade:
+    return MonitoredTrade(
+        id=trade_id, trader_id=7, symbol="BTCUSDT", side="long", sl=90.0, tps=[110.0, 120.0], entries=[100.0], fills=fills or []
+    )
+
+
+def test_exits_stay_inactive_until_an_entry_fills() -> None:
+    monitor = PriceMonitor()
+    monitor.load([_long()])
+    for price in (105.0, 115.0, 125.0):
+        assert monitor.on_tick(Tick("BTCUSDT", price, 0.0)) == []
+
+    assert monitor.drain_updates() == []
+
+
+def test_market_entry_trades_are_active_immediately() -> None:
+    monitor = PriceMonitor()
+    trade = _long()
+    trade.entries = [None]
+    monitor.load([trade])
+    monitor.on_tick(Tick("BTCUSDT", 100.0, 0.0))
+
+    assert [lv.kind for lv in monitor.on_tick(Tick("BTCUSDT", 89.0, 1.0))] == ["sl"]
+
+
+def test_tp_fills_then_close_when_all_targets_hit() -> None:
+    monitor = PriceMonitor()
+    monitor.load([_long()])
+    for price in (105.0, 99.0, 115.0, 125.0):
+        monitor.on_tick(Tick("BTCUSDT", price, 0.0))
+
+    [update] = monitor.drain_updates()
+    assert [f["kind"] for f in update.new_fills] == ["entry", "tp", "tp"]
+    assert update.close
+    assert monitor.level_count == 0
+
+
+def test_gap_through_entry_and_stop_hits_both() -> None:
+    monitor = PriceMonitor()
+    monitor.load([_long()])
+    monitor.on_tick(Tick("BTCUSDT", 105.0, 0.0))
+
+    assert [lv.kind for lv in monitor.on_tick(Tick("BTCUSDT", 80.0, 1.0))] == ["entry", "sl"]
+    assert monitor.drain_updates()[0].close
+
+
+def test_sl_closes_trade_and_skips_remaining_levels() -> None:
+    monitor = PriceMonitor()
+    monitor.load([_long(fills=[{"kind": "entry", "index": 0}])])
+    monitor.on_tick(Tick("BTCUSDT", 105.0, 0.0))
+    hits = monitor.on_tick(Tick("BTCUSDT", 80.0, 1.0))
+
+    assert [lv.kind for lv in hits] == ["sl"]
+    assert monitor.drain_updates()[0].close
+
+
+class FakeRepo:
+    def __init__(self, trades: list[MonitoredTrade]) -> None:
+        self.trades = trades
+        self.applied: list = []
+
+    def load_open_trades(self) -> list[MonitoredTrade]:
+        return self.trades
+
+    def apply_updates(self, updates) -> None:
+        self.applied.extend(updates)
+
+
+def test_run_monitor_replays_ticks_and_batches_writes(tmp_path) -> None:
+    path = tmp_path / "ticks.ndjson"
+    rows = [{"ts": i, "symbol": "BTCUSDT", "price": p} for i, p in enumerate([95.0, 101.0, 89.0])]
+    path.write_text("\n".join(json.dumps(r) for r in rows))
+    repo = FakeRepo([_long()])
+    subscription = SymbolSubscription()
+
+    processed = asyncio.run(
+        run_monitor(PriceMonitor(), replay_ticks(path), repo, flush_interval_s=60, subscription=subscription)
+    )
+
+    assert processed == 3
+    assert subscription.symbols == {"BTCUSDT"}
+    [update] = repo.applied
+    assert [f["kind"] for f in update.new_fills] == ["entry", "sl"]
+    assert update.close
+
+
+class FlakyRepo(FakeRepo):
+    def __init__(self, trades: list[MonitoredTrade]) -> None:
+        super().__init__(trades)
+        self.loads = 0
+        self.failures = 1
+
+    def load_open_trades(self) -> list[MonitoredTrade]:
+        self.loads += 1
+        return super().load_open_trades()
+
+    def apply_updates(self, updates) -> None:
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("db unavailable")
+        super().apply_updates(updates)
+
+
+def test_failed_flush_keeps_updates_and_housekeeping_running(caplog) -> None:
+    async def ticks():
+        for price in (95.0, 101.0, 111.0):
+            yield Tick("BTCUSDT", price, 0.0)
+        await asyncio.sleep(0.1)
+
+    repo = FlakyRepo([_long()])
+    asyncio.run(run_monitor(PriceMonitor(), ticks(), repo, flush_interval_s=0.01, reload_interval_s=0.03))
+
+    assert [f["kind"] for u in repo.applied for f in u.new_fills] == ["entry", "tp"]
+    assert repo.loads >= 2
+    assert "monitor housekeeping failed" in caplog.text
+
+
+def test_live_ticks_waits_for_symbols_and_resubscribes_on_change() -> None:
+    subscribed: list[list[str]] = []
+
+    async def fake_stream(symbols: list[str]):
+        subscribed.append(symbols)
+        while True:
+            await asyncio.sleep(0.001)
+            yield symbols[-1], 1.0, 0.0
+
+    async def scenario() -> None:
+        subscription = SymbolSubscription()
+        ticks = live_ticks(subscription, stream=fake_stream)
+        first = asyncio.ensure_future(anext(ticks))
+        await asyncio.sleep(0.01)
+        assert not first.done() and subscribed == []
+
+        subscription.update({"BTCUSDT"})
+        assert (await first).symbol == "BTCUSDT"
+
+        subscription.update({"BTCUSDT", "ETHUSDT"})
+        assert (await anext(ticks)).symbol == "ETHUSDT"
+        await ticks.aclose()
+
+    asyncio.run(scenario())
+    assert subscribed == [["BTCUSDT"], ["BTCUSDT", "ETHUSDT"]]
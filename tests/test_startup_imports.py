@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.mark.parametrize("module", ["src.parser", "src.worker.parse_worker"])
+def test_entry_point_import_stays_free_of_db_and_web_stacks(module: str) -> None:
+    code = (
+        f"import sys, {module}; "
+        "print(','.join(sorted({m.split('.')[0] for m in sys.modules} & {'sqlalchemy', 'fastapi', 'aiogram'})))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+
+    assert out.stdout.strip() == ""
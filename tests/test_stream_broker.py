@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from src.api.rbac import CurrentUser
+from src.api.stream import EventBroker, handle_notification, sse_events
+from src.db.versions import data_versions
+
+
+def test_broker_filters_by_scope_and_drops_oldest_for_slow_consumers() -> None:
+    async def scenario() -> None:
+        broker = EventBroker(queue_size=2)
+        admin = broker.subscribe(CurrentUser(telegram_user_id=1, role="ADMIN"))
+        trader = broker.subscribe(CurrentUser(telegram_user_id=2, role="TRADER", trader_id=7))
+
+        for i in range(3):
+            broker.publish({"type": "parsed_signal", "id": i, "trader_id": 7})
+        broker.publish({"type": "parsed_signal", "id": 99, "trader_id": 8})
+
+        assert [admin.queue.get_nowait()["id"] for _ in range(2)] == [2, 99]
+        assert [trader.queue.get_nowait()["id"] for _ in range(2)] == [1, 2]
+        assert trader.dropped == 1 and trader.lagged
+
+    asyncio.run(scenario())
+
+
+def test_sse_stream_reports_lag_then_event() -> None:
+    async def scenario() -> list[str]:
+        broker = EventBroker(queue_size=1)
+        sub = broker.subscribe(CurrentUser(telegram_user_id=1, role="ADMIN"))
+        broker.publish({"type": "trade", "id": 1})
+        broker.publish({"type": "trade", "id": 2})
+
+        async def connected() -> bool:
+            return False
+
+        gen = sse_events(sub, connected, heartbeat_s=0.01)
+        chunks = [await gen.__anext__() for _ in range(3)]
+        await gen.aclose()
+        return chunks
+
+    chunks = asyncio.run(scenario())
+    assert chunks[0] == ": connected\n\n"
+    assert chunks[1].startswith("event: lagged\n")
+    assert chunks[2].startswith("event: trade\n") and '"id":2' in chunks[2]
+
+
+def test_unscoped_notification_invalidates_every_cached_scope() -> None:
+    scopes = [(7, False), (8, False), (None, True)]
+    before = [data_versions.for_scope(t, admin) for t, admin in scopes]
+
+    handle_notification('{"type": "reparse", "trader_id": null, "parser_version": "v1"}')
+
+    after = [data_versions.for_scope(t, admin) for t, admin in scopes]
+    assert all(b != a for b, a in zip(before, after))
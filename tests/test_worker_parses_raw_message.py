@@ -1,8 +1,21 @@
 from __future__ import annotations
 
+import json
+import time
 from dataclasses import dataclass
 
-from src.worker.parse_worker import RawMessageLike, parse_once
+from src.parser import parse_block_result
+from src.worker.parse_worker import (
+    LinkedTrade,
+    RawMessageLike,
+    breakeven_price,
+    ReparseBatch,
+    StaleMessage,
+    StoredSignalLike,
+    parse_once,
+    reparse,
+)
+from src.worker.profiling import SignalProfiler, SlowParseRecorder
 
 
 @dataclass
@@ -13,6 +26,7 @@ class _SavedSignal:
     errors_json: list[str]
     warnings_json: list[str]
     parser_version: str
+    trader_id: int | None = None
 
 
 class _FakeRepo:
@@ -31,6 +45,7 @@ class _FakeRepo:
         errors_json: list[str],
         warnings_json: list[str],
         parser_version: str,
+        trader_id: int | None = None,
     ) -> None:
         self.saved.append(
             _SavedSignal(
@@ -40,6 +55,7 @@ class _FakeRepo:
                 errors_json=errors_json,
                 warnings_json=warnings_json,
                 parser_version=parser_version,
+                trader_id=trader_id,
             )
         )
 
@@ -57,3 +73,159 @@ def test_worker_parses_raw_message_into_parsed_signal() -> None:
     assert saved.status in {"READY", "DRAFT", "REJECT"}
     assert saved.payload_json.get("symbol") == "BTCUSDT"
     assert saved.parser_version == "v1"
+
+
+def test_worker_stores_parser_errors_as_draft_and_continues(monkeypatch) -> None:
+    import src.worker.parse_worker as worker
+
+    real_parse = worker.parse_block_result
+
+    def flaky_parse(block: str, **kwargs):
+        if "boom" in block:
+            raise TypeError("boom")
+        return real_parse(block, **kwargs)
+
+    monkeypatch.setattr(worker, "parse_block_result", flaky_parse)
+    good = "$BTCUSDT - SHORT\nВход лимитка 67900\nStop 68700\nTейк-профит\n1) 67000"
+    repo = _FakeRepo([RawMessageLike(id=1, text=good + "\nboom"), RawMessageLike(id=2, text=good)])
+
+    assert parse_once(repo, prefilter=False) == 2
+    assert [(s.raw_message_id, s.status) for s in repo.saved] == [(1, "DRAFT"), (2, "READY")]
+    assert repo.saved[0].errors_json == ["parser error: TypeError: boom"]
+
+
+def test_hardened_worker_shares_one_time_budget_across_blocks(monkeypatch) -> None:
+    import src.worker.parse_worker as worker
+
+    real_parse = worker.parse_block_result
+
+    def slow_parse(block: str, **kwargs):
+        time.sleep(0.15)
+        return real_parse(block, **kwargs)
+
+    monkeypatch.setattr(worker, "DEFAULT_TIME_BUDGET_S", 0.2)
+    monkeypatch.setattr(worker, "parse_block_result", slow_parse)
+    block = "$BTCUSDT - SHORT\nВход лимитка 67900\nStop 68700\nTейк-профит\n1) 67000"
+    repo = _FakeRepo([RawMessageLike(id=1, text="\n\n".join([block] * 3))])
+
+    assert parse_once(repo, hardened=True, prefilter=False) == 3
+    assert [s.status for s in repo.saved] == ["READY", "DRAFT", "DRAFT"]
+    assert repo.saved[2].errors_json == ["parse time budget exceeded"]
+
+
+def test_worker_records_slow_parses(tmp_path) -> None:
+    text = "$BTCUSDT - SHORT\nВход лимитка 67900\nStop 68700\nTейк-профит\n1) 67000"
+    repo = _FakeRepo([RawMessageLike(id=7, text=text)])
+    recorder = SlowParseRecorder(threshold_ms=0, path=tmp_path / "slow.ndjson")
+
+    parse_once(repo, slow_recorder=recorder)
+
+    rows = [json.loads(x) for x in (tmp_path / "slow.ndjson").read_text(encoding="utf-8").splitlines()]
+    assert len(rows) == 1
+    assert rows[0]["raw_message_id"] == 7
+    assert rows[0]["block"].startswith("$BTCUSDT")
+    assert set(rows[0]["stages_ms"]) >= {"symbol", "entry", "sl_tp", "allocations"}
+
+
+def test_signal_profiler_toggle_dumps_stats(tmp_path) -> None:
+    profiler = SignalProfiler(tmp_path)
+
+    assert profiler.toggle() is None
+    parse_once(_FakeRepo([RawMessageLike(id=1, text="$ETHUSDT long\nentry 100\nsl 90\ntp 120")]))
+    dump = profiler.toggle()
+
+    assert dump is not None and dump.exists()
+    assert not profiler.active
+
+
+class _FakeReparseRepo:
+    def __init__(self, stale: list[StaleMessage]) -> None:
+        self._stale = stale
+        self.applied: list[ReparseBatch] = []
+
+    def fetch_stale_messages(self, parser_version: str, after_id: int = 0, limit: int = 500) -> list[StaleMessage]:
+        return [m for m in self._stale if m.raw.id > after_id][:limit]
+
+    def apply_reparse(self, batch: ReparseBatch, parser_version: str) -> None:
+        self.applied.append(batch)
+
+
+def test_reparse_writes_only_changed_rows() -> None:
+    text = "$BTCUSDT - SHORT\nВход лимитка 67900\nStop 68700\nTейк-профит\n1) 67000"
+    current = parse_block_result(text)
+    unchanged = StaleMessage(
+        raw=RawMessageLike(id=1, text=text),
+        signals=[StoredSignalLike(10, current.status, current.signal.to_dict(), current.errors, current.warnings)],
+    )
+    changed = StaleMessage(
+        raw=RawMessageLike(id=2, text=text),
+        signals=[StoredSignalLike(20, "REJECT", {}, [], []), StoredSignalLike(21, "REJECT", {}, [], [])],
+    )
+    repo = _FakeReparseRepo([unchanged, changed])
+
+    report = reparse(repo, batch_size=1)
+
+    assert [b.touch_ids for b in repo.applied] == [[10], []]
+    assert [u["id"] for u in repo.applied[1].updates] == [20]
+    assert repo.applied[1].delete_ids == [21]
+    assert report.unchanged == {current.status: 1}
+    assert report.changed == {f"REJECT->{current.status}": 1}
+    assert report.rows_rewritten == 2
+
+
+class _FakeReplyRepo(_FakeRepo):
+    def __init__(self, messages: list[RawMessageLike], trades: dict[tuple[int, int], LinkedTrade]) -> None:
+        super().__init__(messages)
+        self.trades = trades
+        self.updates: list[tuple[int, list, int]] = []
+
+    def find_reply_trade(self, chat_id: int, message_id: int) -> LinkedTrade | None:
+        return self.trades.get((chat_id, message_id))
+
+    def apply_trade_update(self, trade_id: int, actions: list, raw_message_id: int) -> None:
+        self.updates.append((trade_id, actions, raw_message_id))
+
+
+def test_worker_applies_reply_updates_to_linked_trade() -> None:
+    repo = _FakeReplyRepo(
+        [
+            RawMessageLike(id=2, text="закрыл 50%, стоп в бу", chat_id=-5, reply_to_message_id=100, trader_id=7),
+            RawMessageLike(id=3, text="отмена", chat_id=-5, reply_to_message_id=999, trader_id=7),
+            RawMessageLike(id=4, text="всем привет", chat_id=-5, reply_to_message_id=100, trader_id=7),
+        ],
+        trades={(-5, 100): LinkedTrade(id=42, trader_id=7)},
+    )
+
+    assert parse_once(repo) == 3
+
+    [(trade_id, actions, raw_id)] = repo.updates
+    assert (trade_id, raw_id) == (42, 2)
+    assert [a.kind for a in actions] == ["partial_close", "move_sl"]
+    assert [(s.status, s.errors_json) for s in repo.saved] == [
+        ("READY", []),
+        ("DRAFT", ["reply target has no linked trade"]),
+        ("REJECT", []),
+    ]
+    assert repo.saved[1].payload_json["update"]["actions"][0]["kind"] == "cancel"
+    assert {s.trader_id for s in repo.saved} == {7}
+
+
+def test_worker_ignores_reply_updates_from_another_author() -> None:
+    repo = _FakeReplyRepo(
+        [RawMessageLike(id=5, text="закрыл в плюс, спасибо", chat_id=-5, reply_to_message_id=100, trader_id=8)],
+        trades={(-5, 100): LinkedTrade(id=42, trader_id=7)},
+    )
+
+    assert parse_once(repo) == 1
+
+    assert repo.updates == []
+    [saved] = repo.saved
+    assert saved.status == "REJECT"
+    assert "update" not in saved.payload_json
+
+
+def test_breakeven_prefers_filled_entries() -> None:
+    entries = [{"type": "limit", "price": 100.0}, {"type": "zone", "price_min": 90.0, "price_max": 94.0}]
+    assert breakeven_price(entries, []) == 96.0
+    assert breakeven_price(entries, [{"kind": "entry", "price": 101.0}]) == 101.0
+    assert breakeven_price([{"type": "market", "price": None}], []) is None
@@ -3,38 +3,48 @@
 import { useEffect, useState } from "react";
 import { Input } from "@/components/ui/input";
 
-export type AccessState = { role: "ADMIN" | "TRADER"; telegram_user_id: number };
+// `token` is the API token the bot sends on /token. Role and telegram_user_id are
+// only used by APIs running with API_ALLOW_HEADER_AUTH=1 (local dev).
+export type AccessState = { role: "ADMIN" | "TRADER"; telegram_user_id: number; token?: string };
 
-const DEFAULT_ACCESS: AccessState = { role: "TRADER", telegram_user_id: 1001 };
+const DEFAULT_ACCESS: AccessState = { role: "TRADER", telegram_user_id: 1001, token: "" };
 
 export function readAccess(): AccessState {
   if (typeof window === "undefined") return DEFAULT_ACCESS;
   const raw = localStorage.getItem("journal_access_v1");
   if (!raw) return DEFAULT_ACCESS;
   try {
-    return JSON.parse(raw) as AccessState;
+    return { ...DEFAULT_ACCESS, ...(JSON.parse(raw) as AccessState) };
   } catch {
     return DEFAULT_ACCESS;
   }
 }
 
+export function authHeaders(access: AccessState = readAccess()): Record<string, string> {
+  if (access.token) return { Authorization: `Bearer ${access.token}` };
+  return { "X-Role": access.role, "X-Telegram-User-Id": String(access.telegram_user_id) };
+}
+
 export function AccessPanel() {
   const [role, setRole] = useState<"ADMIN" | "TRADER">("TRADER");
   const [telegramUserId, setTelegramUserId] = useState("1001");
+  const [token, setToken] = useState("");
 
   useEffect(() => {
     const saved = readAccess();
     setRole(saved.role);
     setTelegramUserId(String(saved.telegram_user_id));
+    setToken(saved.token ?? "");
   }, []);
 
   useEffect(() => {
     const payload: AccessState = {
       role,
       telegram_user_id: Number(telegramUserId || "0"),
+      token: token.trim(),
     };
     localStorage.setItem("journal_access_v1", JSON.stringify(payload));
-  }, [role, telegramUserId]);
+  }, [role, telegramUserId, token]);
 
   return (
     <div className="flex items-center gap-2 rounded-md border bg-white p-2 text-sm">
@@ -45,6 +55,14 @@ export function AccessPanel() {
       </select>
       <label className="text-slate-500">telegram_user_id</label>
       <Input value={telegramUserId} onChange={(e) => setTelegramUserId(e.target.value)} className="w-28" />
+      <label className="text-slate-500">API token</label>
+      <Input
+        type="password"
+        value={token}
+        onChange={(e) => setToken(e.target.value)}
+        placeholder="/token in the bot"
+        className="w-48"
+      />
     </div>
   );
 }